@@ -1,5 +1,8 @@
 ﻿from app.services.gemini_service import gemini_service
-from typing import List, Dict, Any
+from app.core.executor import run_blocking
+from app.services.single_flight import generation_flight
+from app.services.project_classifier import ProjectFeatures
+from typing import List, Dict, Any, AsyncIterator, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,14 +12,15 @@ class BacklogAgent:
         self.name = "Backlog Agent"
         self.description = "Génère les User Stories et le backlog Agile"
     
-    def generate_user_stories(self, project_description: str) -> List[Dict[str, Any]]:
+    def generate_user_stories(self, project_description: str,
+                              features: Optional[ProjectFeatures] = None) -> List[Dict[str, Any]]:
         """
         Génère 10-15 User Stories pour le projet
         """
         logger.info("📝 Backlog Agent: Génération des User Stories...")
         
         try:
-            stories = gemini_service.generate_user_stories(project_description)
+            stories = gemini_service.generate_user_stories(project_description, features)
             
             # Assigner les stories aux sprints (simplifié)
             for i, story in enumerate(stories):
@@ -29,6 +33,57 @@ class BacklogAgent:
             logger.error(f"❌ Backlog Agent error: {e}")
             return gemini_service._get_default_stories()
     
+    async def generate_user_stories_async(self, project_description: str,
+                                          features: Optional[ProjectFeatures] = None) -> List[Dict[str, Any]]:
+        """
+        Version async: la génération passe par le fournisseur LLM configuré.
+        Les requêtes identiques simultanées partagent un seul appel (single-flight).
+        """
+        return await generation_flight.do(
+            gemini_service.cache_key("backlog", project_description),
+            lambda: self._generate_user_stories_async(project_description, features)
+        )
+    
+    async def stream_user_stories_async(self, project_description: str,
+                                        features: Optional[ProjectFeatures] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        User Stories produites une par une dès que le fournisseur les a parsées.
+        Échec avant la première story: stories par défaut; après: l'erreur remonte (déjà émises).
+        """
+        logger.info("📝 Backlog Agent: Génération des User Stories (streaming)...")
+        count = 0
+        try:
+            async for story in gemini_service.stream_user_stories_async(project_description, features):
+                story["sprint"] = (count // 5) + 1  # 5 stories par sprint
+                count += 1
+                yield story
+        except Exception as e:
+            if count:
+                raise
+            logger.error(f"❌ Backlog Agent error: {e}")
+            for story in await run_blocking(gemini_service._get_default_stories):
+                count += 1
+                yield story
+        logger.info(f"✅ Backlog Agent: {count} User Stories générées")
+    
+    async def _generate_user_stories_async(self, project_description: str,
+                                           features: Optional[ProjectFeatures] = None) -> List[Dict[str, Any]]:
+        logger.info("📝 Backlog Agent: Génération des User Stories...")
+        
+        try:
+            stories = await gemini_service.generate_user_stories_async(project_description, features)
+            
+            # Assigner les stories aux sprints (simplifié)
+            for i, story in enumerate(stories):
+                story["sprint"] = (i // 5) + 1  # 5 stories par sprint
+            
+            logger.info(f"✅ Backlog Agent: {len(stories)} User Stories générées")
+            return stories
+            
+        except Exception as e:
+            logger.error(f"❌ Backlog Agent error: {e}")
+            return await run_blocking(gemini_service._get_default_stories)
+    
     def calculate_velocity(self, stories: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Calcule la vélocité estimée du projet
@@ -1,64 +1,191 @@
 ﻿from app.agents.planner_agent import PlannerAgent
 from app.agents.scheduler_agent import SchedulerAgent
 from app.agents.backlog_agent import BacklogAgent
+from app.agents.tech_advisor_agent import TechAdvisorAgent
+from app.core.config import settings
+from app.services.gemini_service import gemini_service
+from app.services.project_classifier import classify_project
+from app.services.rate_limiter import llm_context
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
 class AgentCoordinator:
-    def __init__(self):
+    def __init__(self, agent_timeout: Optional[float] = None):
         self.planner = PlannerAgent()
         self.scheduler = SchedulerAgent()
         self.backlog = BacklogAgent()
-    
-    def create_project(self, project_data: Dict[str, Any]) -> Dict[str, Any]:
+        self.tech_advisor = TechAdvisorAgent()
+        self.agent_timeout = agent_timeout if agent_timeout is not None else settings.AGENT_TIMEOUT_SECONDS
+
+    async def _run_agent(self, agent_name: str, call: Awaitable, fallback: Callable) -> Tuple[Any, str]:
+        """
+        Attend un agent avec timeout, retourne (résultat, statut)
+        """
+        try:
+            result = await asyncio.wait_for(call, timeout=self.agent_timeout)
+            return result, "completed"
+        except asyncio.TimeoutError:
+            logger.error(f"⏱️ {agent_name}: timeout après {self.agent_timeout}s, utilisation des valeurs par défaut")
+            return fallback(), "timeout"
+
+    async def _stream_agent(self, agent_name: str, items: AsyncIterator, event: str, queue: asyncio.Queue,
+                            fallback: Callable) -> Tuple[List[Any], str]:
+        """
+        Consomme un agent en streaming avec timeout: chaque élément part dans `queue` dès qu'il est
+        parsé. Timeout avant le premier élément: valeurs par défaut (comme _run_agent); après: erreur.
         """
-        Orchestre les 3 agents pour créer un projet complet
+        collected: List[Any] = []
+
+        async def consume() -> None:
+            try:
+                async for item in items:
+                    collected.append(item)
+                    queue.put_nowait((event, item))
+            finally:
+                await items.aclose()
+
+        try:
+            await asyncio.wait_for(consume(), timeout=self.agent_timeout)
+            return collected, "completed"
+        except asyncio.TimeoutError:
+            if collected:
+                raise RuntimeError(f"{agent_name}: timeout après {len(collected)} éléments déjà émis")
+            logger.error(f"⏱️ {agent_name}: timeout après {self.agent_timeout}s, utilisation des valeurs par défaut")
+            defaults = fallback()
+            for item in defaults:
+                queue.put_nowait((event, item))
+            return defaults, "timeout"
+
+    async def create_project(self, project_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Orchestre les agents pour créer un projet complet.
+        Planner, Backlog et Tech Advisor tournent en parallèle, seul le Scheduler attend le Planner.
+        """
+        # Réponse complète seulement: générations non streamées, partagées par single-flight
+        async for event, data in self.stream_project(project_data, incremental=False):
+            if event == "result":
+                return data
+
+    async def stream_project(self, project_data: Dict[str, Any],
+                             incremental: bool = True) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Même orchestration que create_project, mais produit des événements (nom, données)
+        dès que chaque étape se termine: task (une par une), schedule, story (une par une),
+        recommendations, metrics, puis result (le projet complet).
+        `incremental`: tâches et stories émises dès que le fournisseur LLM les a parsées
+        (avec le fournisseur HTTP, la première tâche part avant la fin de la génération).
         """
         logger.info("🚀 Agent Coordinator: Démarrage de la création de projet...")
-        
+
+        pending: Dict[asyncio.Future, str] = {}
+        next_item: Optional[asyncio.Future] = None
         try:
-            # Étape 1: Planner Agent - Générer les tâches
-            logger.info("Étape 1/3: Génération des tâches...")
-            tasks = self.planner.generate_tasks(project_data["description"])
-            
-            # Étape 2: Scheduler Agent - Créer le planning
-            logger.info("Étape 2/3: Création du planning...")
+            description = project_data["description"]
             start_date = datetime.fromisoformat(project_data["start_date"]) if isinstance(project_data["start_date"], str) else project_data["start_date"]
-            scheduled_tasks = self.scheduler.create_schedule(tasks, start_date)
-            
-            # Étape 3: Backlog Agent - Générer les User Stories
-            logger.info("Étape 3/3: Génération du backlog...")
-            user_stories = self.backlog.generate_user_stories(project_data["description"])
-            
+            # Classification faite une fois, partagée par les trois agents
+            features = classify_project(description)
+
+            # Étape 1: Planner, Backlog et Tech Advisor en parallèle
+            logger.info("Étape 1/2: Génération des tâches, du backlog et du stack en parallèle...")
+            # Les agents héritent du contexte (projet) pour le partage équitable du quota LLM
+            # Tâches et stories parsées au fil de l'eau par les agents en streaming
+            items: asyncio.Queue = asyncio.Queue()
+            with llm_context(project=project_data["name"]):
+                if incremental:
+                    planner_call = self._stream_agent(self.planner.name, self.planner.stream_tasks_async(description, features),
+                                                      "task", items, fallback=gemini_service._get_default_tasks)
+                    backlog_call = self._stream_agent(self.backlog.name, self.backlog.stream_user_stories_async(description, features),
+                                                      "story", items, fallback=gemini_service._get_default_stories)
+                else:
+                    planner_call = self._run_agent(self.planner.name, self.planner.generate_tasks_async(description, features),
+                                                   fallback=gemini_service._get_default_tasks)
+                    backlog_call = self._run_agent(self.backlog.name, self.backlog.generate_user_stories_async(description, features),
+                                                   fallback=gemini_service._get_default_stories)
+                pending = {
+                    asyncio.ensure_future(planner_call): "planner",
+                    asyncio.ensure_future(backlog_call): "backlog",
+                    asyncio.ensure_future(self._run_agent(self.tech_advisor.name, self.tech_advisor.recommend_stack_async(description, features),
+                                                          fallback=lambda: self.tech_advisor.recommend_stack(""))): "tech",
+                }
+            results: Dict[str, Tuple[Any, str]] = {}
+            scheduled_tasks = user_stories = None
+
+            # Chaque élément, puis chaque agent, est émis dès qu'il est prêt, sans attendre les autres
+            while pending:
+                next_item = asyncio.ensure_future(items.get())
+                done, _ = await asyncio.wait([*pending, next_item], return_when=asyncio.FIRST_COMPLETED)
+                if next_item.done():
+                    yield next_item.result()
+                else:
+                    next_item.cancel()
+                next_item = None
+                for future in done:
+                    if future not in pending:
+                        continue
+                    name = pending.pop(future)
+                    results[name] = future.result()
+                    output = results[name][0]
+                    # Éléments restants de l'agent terminé, avant les étapes qui en dépendent
+                    while not items.empty():
+                        yield items.get_nowait()
+
+                    if name == "planner":
+                        if not incremental:
+                            for task in output:
+                                yield "task", task
+                        # Étape 2: Scheduler Agent - dépend des tâches du Planner
+                        logger.info("Étape 2/2: Création du planning...")
+                        scheduled_tasks = await self.scheduler.create_schedule_async(output, start_date)
+                        yield "schedule", {
+                            "tasks": scheduled_tasks,
+                            "project_duration": self.scheduler.calculate_project_duration(scheduled_tasks)
+                        }
+                    elif name == "backlog":
+                        user_stories = output
+                        if not incremental:
+                            for story in user_stories:
+                                yield "story", story
+                    else:
+                        yield "recommendations", output
+
             # Calculer les métriques
-            project_duration = self.scheduler.calculate_project_duration(scheduled_tasks)
-            velocity = self.backlog.calculate_velocity(user_stories)
-            
+            metrics = {
+                "project_duration": self.scheduler.calculate_project_duration(scheduled_tasks),
+                "agile_metrics": self.backlog.calculate_velocity(user_stories)
+            }
+            yield "metrics", metrics
+
             # Créer le projet complet
             project = {
                 "name": project_data["name"],
-                "description": project_data["description"],
+                "description": description,
                 "start_date": start_date.isoformat(),
                 "created_at": datetime.utcnow().isoformat(),
                 "tasks": scheduled_tasks,
                 "user_stories": user_stories,
-                "metrics": {
-                    "project_duration": project_duration,
-                    "agile_metrics": velocity
-                },
+                "tech_recommendations": results["tech"][0],
+                "metrics": metrics,
                 "agents_used": [
-                    {"name": self.planner.name, "status": "completed"},
+                    {"name": self.planner.name, "status": results["planner"][1]},
                     {"name": self.scheduler.name, "status": "completed"},
-                    {"name": self.backlog.name, "status": "completed"}
+                    {"name": self.backlog.name, "status": results["backlog"][1]},
+                    {"name": self.tech_advisor.name, "status": results["tech"][1]}
                 ]
             }
-            
+
             logger.info("✅ Agent Coordinator: Projet créé avec succès!")
-            return project
-            
+            yield "result", project
+
         except Exception as e:
             logger.error(f"❌ Agent Coordinator error: {e}")
             raise Exception(f"Erreur lors de la création du projet: {str(e)}")
+        finally:
+            # Client déconnecté ou erreur: ne pas laisser tourner les agents restants
+            for future in pending:
+                future.cancel()
+            if next_item is not None:
+                next_item.cancel()
@@ -1,5 +1,8 @@
 ﻿from app.services.gemini_service import gemini_service
-from typing import List, Dict, Any
+from app.core.executor import run_blocking
+from app.services.single_flight import generation_flight
+from app.services.project_classifier import ProjectFeatures
+from typing import List, Dict, Any, AsyncIterator, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,14 +12,15 @@ class PlannerAgent:
         self.name = "Planner Agent"
         self.description = "Génère les tâches détaillées du projet"
     
-    def generate_tasks(self, project_description: str) -> List[Dict[str, Any]]:
+    def generate_tasks(self, project_description: str,
+                       features: Optional[ProjectFeatures] = None) -> List[Dict[str, Any]]:
         """
         Génère 15-20 tâches détaillées pour un projet
         """
         logger.info("🤖 Planner Agent: Génération des tâches...")
         
         try:
-            tasks = gemini_service.generate_tasks(project_description)
+            tasks = gemini_service.generate_tasks(project_description, features)
             
             logger.info(f"✅ Planner Agent: {len(tasks)} tâches générées")
             return tasks
@@ -25,3 +29,49 @@ class PlannerAgent:
             logger.error(f"❌ Planner Agent error: {e}")
             # Retourner des tâches par défaut
             return gemini_service._get_default_tasks()
+    
+    async def generate_tasks_async(self, project_description: str,
+                                   features: Optional[ProjectFeatures] = None) -> List[Dict[str, Any]]:
+        """
+        Version async: la génération passe par le fournisseur LLM configuré.
+        Les requêtes identiques simultanées partagent un seul appel (single-flight).
+        """
+        return await generation_flight.do(
+            gemini_service.cache_key("planner", project_description),
+            lambda: self._generate_tasks_async(project_description, features)
+        )
+    
+    async def stream_tasks_async(self, project_description: str,
+                                 features: Optional[ProjectFeatures] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Tâches produites une par une dès que le fournisseur les a parsées.
+        Échec avant la première tâche: tâches par défaut; après: l'erreur remonte (déjà émises).
+        """
+        logger.info("🤖 Planner Agent: Génération des tâches (streaming)...")
+        count = 0
+        try:
+            async for task in gemini_service.stream_tasks_async(project_description, features):
+                count += 1
+                yield task
+        except Exception as e:
+            if count:
+                raise
+            logger.error(f"❌ Planner Agent error: {e}")
+            for task in await run_blocking(gemini_service._get_default_tasks):
+                count += 1
+                yield task
+        logger.info(f"✅ Planner Agent: {count} tâches générées")
+    
+    async def _generate_tasks_async(self, project_description: str,
+                                    features: Optional[ProjectFeatures] = None) -> List[Dict[str, Any]]:
+        logger.info("🤖 Planner Agent: Génération des tâches...")
+        
+        try:
+            tasks = await gemini_service.generate_tasks_async(project_description, features)
+            
+            logger.info(f"✅ Planner Agent: {len(tasks)} tâches générées")
+            return tasks
+            
+        except Exception as e:
+            logger.error(f"❌ Planner Agent error: {e}")
+            return await run_blocking(gemini_service._get_default_tasks)
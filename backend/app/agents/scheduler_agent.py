@@ -1,5 +1,10 @@
-﻿from datetime import datetime, timedelta
-from typing import List, Dict, Any
+﻿from datetime import datetime
+from typing import List, Dict, Any, Optional
+from app.core.executor import run_cpu_for
+from app.services.work_calendar import DEFAULT_CALENDAR, WorkCalendar
+from app.services.schedule_engine import (
+    DEFAULT_ROLE, PRIORITY_RANKS, DependencyGraph, compute_resource_schedule, compute_schedule
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,51 +14,57 @@ class SchedulerAgent:
         self.name = "Scheduler Agent"
         self.description = "Crée le planning et le diagramme de Gantt"
     
-    def create_schedule(self, tasks: List[Dict[str, Any]], start_date: datetime) -> List[Dict[str, Any]]:
+    def create_schedule(self, tasks: List[Dict[str, Any]], start_date: datetime,
+                        workers: Optional[int] = None, roles: Optional[Dict[str, int]] = None,
+                        calendar: Optional[WorkCalendar] = None) -> List[Dict[str, Any]]:
         """
-        Calcule les dates de début et fin pour chaque tâche
+        Calcule les dates de début et fin pour chaque tâche (chemin critique), en jours ouvrés.
+        Avec `workers` (ou `roles`: ressources par rôle), les tâches sont réparties sur une équipe finie.
         """
+        calendar = calendar or DEFAULT_CALENDAR
         logger.info("📅 Scheduler Agent: Création du planning...")
         
-        # Trier les tâches par ordre et dépendances
-        scheduled_tasks = []
+        # Graphe construit une seule fois, tri topologique + passes avant/arrière
+        graph = DependencyGraph.from_tasks(tasks)
+        if graph.unknown_dependencies:
+            logger.warning(f"⚠️ Scheduler Agent: {graph.unknown_dependencies} dépendances inconnues ignorées")
+        result = compute_schedule(graph)
+        starts, finishes, assigned_to = result.earliest_start, result.earliest_finish, None
+        latest_starts, slack = result.latest_start, result.slack
+        
+        # Mode ressources: list scheduler par priorité puis longueur de chaîne critique
+        if workers or roles:
+            capacity = dict(roles or {})
+            if workers:
+                capacity[DEFAULT_ROLE] = workers
+            constrained = compute_resource_schedule(
+                graph,
+                capacity,
+                roles=[task.get("role") or DEFAULT_ROLE for task in tasks],
+                priorities=[PRIORITY_RANKS.get(task.get("priority"), PRIORITY_RANKS["medium"]) for task in tasks]
+            )
+            starts, finishes, assigned_to = constrained.start, constrained.finish, constrained.assigned_to
+            # Marges et chemin critique du planning contraint (et non du CPM sans ressources)
+            latest_starts, slack = constrained.latest_start, constrained.slack
         
-        # Dictionnaire pour stocker les dates de fin par tâche
-        end_dates = {}
+        # Les décalages sont en jours ouvrés: rang du début + décalage -> date, une fois par décalage
+        iso_dates: Dict[int, str] = {}
+        def to_iso(offset: int) -> str:
+            iso = iso_dates.get(offset)
+            if iso is None:
+                iso = iso_dates[offset] = calendar.add_working_days(start_date, offset).isoformat()
+            return iso
         
-        for task in tasks:
-            task_id = str(task["id"])
-            duration = task.get("duration_days", 1)
-            
-            # Calculer la date de début
-            if "dependencies" in task and task["dependencies"]:
-                # Dépend de la fin de la dernière tâche dépendante
-                deps = str(task["dependencies"]).split(",")
-                latest_end = start_date
-                
-                for dep_id in deps:
-                    dep_id = dep_id.strip()
-                    if dep_id in end_dates:
-                        dep_end = end_dates[dep_id]
-                        if dep_end > latest_end:
-                            latest_end = dep_end
-                
-                task_start = latest_end
-            else:
-                # Pas de dépendances, commence à la date de début du projet
-                task_start = start_date
-            
-            # Calculer la date de fin
-            task_end = task_start + timedelta(days=duration)
-            
-            # Mettre à jour end_dates
-            end_dates[task_id] = task_end
-            
-            # Ajouter les dates à la tâche
+        scheduled_tasks = []
+        for i, task in enumerate(tasks):
             scheduled_task = task.copy()
-            scheduled_task["start_date"] = task_start.isoformat()
-            scheduled_task["end_date"] = task_end.isoformat()
-            
+            scheduled_task["start_date"] = to_iso(starts[i])
+            scheduled_task["end_date"] = to_iso(finishes[i])
+            scheduled_task["latest_start"] = to_iso(latest_starts[i])
+            scheduled_task["slack_days"] = slack[i]
+            scheduled_task["is_critical"] = slack[i] == 0
+            if assigned_to:
+                scheduled_task["assigned_to"] = assigned_to[i]
             scheduled_tasks.append(scheduled_task)
         
         # Trier par date de début
@@ -62,10 +73,20 @@ class SchedulerAgent:
         logger.info(f"✅ Scheduler Agent: Planning créé pour {len(scheduled_tasks)} tâches")
         return scheduled_tasks
     
-    def calculate_project_duration(self, tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def create_schedule_async(self, tasks: List[Dict[str, Any]], start_date: datetime,
+                                    workers: Optional[int] = None, roles: Optional[Dict[str, int]] = None,
+                                    calendar: Optional[WorkCalendar] = None) -> List[Dict[str, Any]]:
+        """
+        Version async: le calcul tourne dans le pool de threads, ou de processus pour les gros graphes
+        """
+        return await run_cpu_for(len(tasks), self.create_schedule, tasks, start_date, workers, roles, calendar)
+    
+    def calculate_project_duration(self, tasks: List[Dict[str, Any]],
+                                   calendar: Optional[WorkCalendar] = None) -> Dict[str, Any]:
         """
         Calcule la durée totale du projet
         """
+        calendar = calendar or DEFAULT_CALENDAR
         if not tasks:
             return {"total_days": 0, "end_date": None}
         
@@ -85,6 +106,7 @@ class SchedulerAgent:
         
         return {
             "total_days": total_days,
+            "working_days": calendar.working_days_between(min_start_date, max_end_date),
             "start_date": min_start_date.isoformat(),
             "end_date": max_end_date.isoformat()
         }
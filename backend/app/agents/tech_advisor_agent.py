@@ -1,6 +1,8 @@
 # app/agents/tech_advisor_agent.py
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+from app.core.executor import run_cpu
+from app.services.project_classifier import ProjectFeatures, classify_project
 
 
 class TechAdvisorAgent:
@@ -11,19 +13,20 @@ class TechAdvisorAgent:
     def __init__(self):
         self.name = "Tech Advisor"
     
-    def recommend_stack(self, project_description: str) -> Dict[str, Any]:
+    def recommend_stack(self, project_description: str,
+                        features: Optional[ProjectFeatures] = None) -> Dict[str, Any]:
         """
         Génère des recommendations technologiques selon le projet
         """
-        desc_lower = project_description.lower()
+        features = features or classify_project(project_description)
         
         # Détection du projet
-        is_web = any(word in desc_lower for word in ['site', 'web', 'application web'])
-        is_mobile = any(word in desc_lower for word in ['mobile', 'ios', 'android', 'app mobile'])
-        is_api = any(word in desc_lower for word in ['api', 'backend', 'serveur'])
-        is_ecommerce = any(word in desc_lower for word in ['e-commerce', 'ecommerce', 'boutique', 'shop'])
-        is_dashboard = any(word in desc_lower for word in ['dashboard', 'tableau de bord', 'analytics'])
-        is_realtime = any(word in desc_lower for word in ['temps réel', 'realtime', 'chat', 'notification'])
+        is_web = features.has("tech_advisor", "web")
+        is_mobile = features.has("tech_advisor", "mobile")
+        is_api = features.has("tech_advisor", "api")
+        is_ecommerce = features.has("tech_advisor", "ecommerce")
+        is_dashboard = features.has("tech_advisor", "dashboard")
+        is_realtime = features.has("tech_advisor", "realtime")
         
         recommendations = {
             "frontend": [],
@@ -197,25 +200,17 @@ class TechAdvisorAgent:
             })
         
         return {
-            "project_type": self._detect_project_type(desc_lower),
+            "project_type": features.project_type,
             "recommendations": recommendations,
             "summary": self._generate_summary(recommendations)
         }
     
-    def _detect_project_type(self, desc_lower: str) -> str:
-        """Détecte le type de projet"""
-        if 'e-commerce' in desc_lower or 'ecommerce' in desc_lower:
-            return "E-commerce"
-        elif 'mobile' in desc_lower:
-            return "Application Mobile"
-        elif 'dashboard' in desc_lower or 'tableau de bord' in desc_lower:
-            return "Dashboard / Analytics"
-        elif 'api' in desc_lower:
-            return "Backend API"
-        elif 'site' in desc_lower or 'web' in desc_lower:
-            return "Application Web"
-        else:
-            return "Projet Logiciel"
+    async def recommend_stack_async(self, project_description: str,
+                                    features: Optional[ProjectFeatures] = None) -> Dict[str, Any]:
+        """
+        Version async: l'analyse tourne dans le pool de processus (ou de threads, voir run_cpu)
+        """
+        return await run_cpu(self.recommend_stack, project_description, features)
     
     def _generate_summary(self, recommendations: Dict) -> str:
         """Génère un résumé du stack"""
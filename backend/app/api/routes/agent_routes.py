@@ -1,21 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any
-from datetime import datetime, date
-from app.core.database import get_db
-from app.models.project import Project
+from datetime import date
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, get_async_db
+from app.core.responses import PydanticJSONResponse, dumps
 from app.models.task import Task
-from app.models.user_story import UserStory
+from app.services.project_generation import generate_batch, generated_project_response, persist_generated_project
+from app.services.dependencies import get_downstream_ids, get_predecessor_ids, get_successor_ids
+from app.services.incremental_scheduler import reschedule_downstream
+from app.services.response_cache import response_cache
 from app.schemas.project import ProjectCreate
+from app.schemas.generation import BatchError, GeneratedProjectResponse
 from app.agents.coordinator import AgentCoordinator
-from app.agents.tech_advisor_agent import TechAdvisorAgent
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-@router.post("/generate")
-async def generate_project(project_data: ProjectCreate, db: Session = Depends(get_db)):
+@router.post("/generate", response_model=GeneratedProjectResponse)
+async def generate_project(project_data: ProjectCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Endpoint principal qui orchestre les 3 agents pour créer un projet complet
     """
@@ -32,169 +39,144 @@ async def generate_project(project_data: ProjectCreate, db: Session = Depends(ge
             "start_date": project_data.start_date.isoformat() if isinstance(project_data.start_date, date) else project_data.start_date
         }
         
-        # Orchestrer les agents
-        result = coordinator.create_project(project_dict)
+        # Orchestrer les agents (Planner, Backlog et Tech Advisor en parallèle)
+        result = await coordinator.create_project(project_dict)
         
-        # Obtenir les recommandations tech
-        tech_advisor = TechAdvisorAgent()
-        tech_recommendations = tech_advisor.recommend_stack(project_data.description)
-        
-        # Créer le projet en base
-        db_project = Project(
-            name=result["name"],
-            description=result["description"],
-            start_date=datetime.fromisoformat(result["start_date"]).date(),
-            status="active"
-        )
-        db.add(db_project)
-        db.commit()
-        db.refresh(db_project)
-        
-        # Sauvegarder les tâches
-        tasks_list = []
-        for task_data in result.get("tasks", []):
-            db_task = Task(
-                project_id=db_project.id,
-                title=task_data.get("title", ""),
-                description=task_data.get("description", ""),
-                duration_days=task_data.get("duration_days", 1),
-                start_date=datetime.fromisoformat(task_data["start_date"]).date() if task_data.get("start_date") else None,
-                end_date=datetime.fromisoformat(task_data["end_date"]).date() if task_data.get("end_date") else None,
-                priority=task_data.get("priority", "medium"),
-                status=task_data.get("status", "todo"),
-                dependencies=task_data.get("dependencies", ""),
-                order=task_data.get("order", 0)
-            )
-            db.add(db_task)
-            tasks_list.append(db_task)
-        
-        # Sauvegarder les user stories
-        stories_list = []
-        for story_data in result.get("user_stories", []):
-            db_story = UserStory(
-                project_id=db_project.id,
-                title=story_data.get("title", ""),
-                description=story_data.get("description", ""),
-                points=story_data.get("points", 0),
-                priority=story_data.get("priority", "Should Have"),
-                status=story_data.get("status", "todo"),
-                sprint=story_data.get("sprint", 0),
-                acceptance_criteria=story_data.get("acceptance_criteria", "")
-            )
-            db.add(db_story)
-            stories_list.append(db_story)
-        
-        db.commit()
-        
-        # Rafraîchir pour obtenir les IDs
-        for task in tasks_list:
-            db.refresh(task)
-        for story in stories_list:
-            db.refresh(story)
-        
-        # Générer le code Mermaid pour le Gantt
-        gantt_code = generate_gantt_code(result.get("tasks", []), result["name"])
-        
-        # Retourner la réponse complète
-        return {
-            "success": True,
-            "project": {
-                "id": db_project.id,
-                "name": db_project.name,
-                "description": db_project.description,
-                "start_date": db_project.start_date.isoformat(),
-                "created_at": db_project.created_at.isoformat() if db_project.created_at else None,
-                "status": db_project.status
-            },
-            "tasks": [
-                {
-                    "id": task.id,
-                    "title": task.title,
-                    "description": task.description,
-                    "duration_days": task.duration_days,
-                    "start_date": task.start_date.isoformat() if task.start_date else None,
-                    "end_date": task.end_date.isoformat() if task.end_date else None,
-                    "priority": task.priority,
-                    "status": task.status,
-                    "dependencies": task.dependencies,
-                    "order": task.order
-                }
-                for task in tasks_list
-            ],
-            "user_stories": [
-                {
-                    "id": story.id,
-                    "title": story.title,
-                    "description": story.description,
-                    "points": story.points,
-                    "priority": story.priority,
-                    "status": story.status,
-                    "sprint": story.sprint,
-                    "acceptance_criteria": story.acceptance_criteria
-                }
-                for story in stories_list
-            ],
-            "gantt_code": gantt_code,
-            "tech_recommendations": tech_recommendations,
-            "metrics": result.get("metrics", {}),
-            "agents_used": result.get("agents_used", [])
-        }
+        # Créer le projet, ses tâches et user stories en base
+        db_project, tasks_list, stories_list = await persist_generated_project(db, result)
+        # Modèle typé sérialisé directement par pydantic-core (pas de jsonable_encoder)
+        return PydanticJSONResponse(await generated_project_response(result, db_project, tasks_list, stories_list))
         
     except Exception as e:
         logger.error(f"❌ Erreur lors de la génération: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur: {str(e)}")
 
 
-@router.patch("/tasks/{task_id}/status")
-async def update_task_status(task_id: int, status: str, db: Session = Depends(get_db)):
+@router.post("/generate/stream")
+async def generate_project_stream(project_data: ProjectCreate):
     """
-    Met à jour le statut d'une tâche
+    Variante streaming de /generate (server-sent events): chaque étape est émise dès qu'elle
+    se termine (task, schedule, story, recommendations, metrics), puis `project` avec les ids en base
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
+    logger.info(f"🚀 Création du projet (streaming): {project_data.name}")
+    project_dict = {
+        "name": project_data.name,
+        "description": project_data.description,
+        "start_date": project_data.start_date.isoformat() if isinstance(project_data.start_date, date) else project_data.start_date
+    }
     
-    task.status = status
-    db.commit()
-    db.refresh(task)
+    async def events():
+        try:
+            async for event, data in AgentCoordinator().stream_project(project_dict):
+                if event != "result":
+                    yield _sse(event, data)
+                    continue
+                # La session vit dans le générateur: celle des dépendances peut être fermée avant la fin du flux
+                async with AsyncSessionLocal() as db:
+                    db_project, tasks_list, stories_list = await persist_generated_project(db, data)
+                    yield _sse("project", await generated_project_response(data, db_project, tasks_list, stories_list))
+            yield _sse("done", {"success": True})
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de la génération (streaming): {str(e)}")
+            yield _sse("error", {"detail": f"Erreur: {str(e)}"})
     
-    return {"success": True, "task": task}
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 
+def _sse(event: str, data: Any) -> str:
+    """Formate un événement server-sent events (données: dict ou modèle de réponse)"""
+    return f"event: {event}\ndata: {dumps(data).decode()}\n\n"
 
-def generate_gantt_code(tasks: list, project_name: str) -> str:
-    """Génère le code Mermaid pour le diagramme de Gantt"""
-    gantt_lines = [
-        "gantt",
-        f"    title {project_name}",
-        "    dateFormat YYYY-MM-DD",
-        ""
-    ]
+
+@router.post("/generate-batch")
+async def generate_project_batch(
+    request: Request,
+    full: bool = Query(False, description="Inclure tâches, stories et Gantt de chaque projet")
+):
+    """
+    Génère un lot de projets: tableau JSON de ProjectCreate, ou NDJSON (un projet par ligne,
+    Content-Type application/x-ndjson). La réponse est un flux NDJSON d'un résultat par projet
+    (`index` = position dans le lot), émis au fil de la persistance.
+    """
+    body = await request.body()
+    try:
+        if "ndjson" in request.headers.get("content-type", ""):
+            items = [json.loads(line) for line in body.decode("utf-8").splitlines() if line.strip()]
+        else:
+            items = json.loads(body or b"null")
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Corps invalide: {e}")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Un tableau de projets (ou du NDJSON) est attendu")
+    if len(items) > settings.BATCH_MAX_PROJECTS:
+        raise HTTPException(status_code=413, detail=f"Au plus {settings.BATCH_MAX_PROJECTS} projets par lot")
     
-    for task in tasks:
-        status = "done" if task.get("status") == "done" else "active" if task.get("status") == "in_progress" else "crit"
-        start = task.get("start_date", "")
-        duration = task.get("duration_days", 1)
-        
-        gantt_lines.append(f"    {task.get('title', 'Task')} :{status}, {start}, {duration}d")
+    # Validation par projet: une entrée invalide ne fait pas échouer le lot
+    projects, invalid = [], []
+    for index, item in enumerate(items):
+        try:
+            project_data = ProjectCreate.model_validate(item)
+        except ValidationError as e:
+            invalid.append(BatchError(index=index, error=e.errors(include_url=False)))
+            continue
+        projects.append((index, {
+            "name": project_data.name,
+            "description": project_data.description or "",
+            "start_date": project_data.start_date.isoformat()
+        }))
+    logger.info(f"📦 Génération par lot: {len(projects)} projets valides, {len(invalid)} invalides")
     
-    return "\n".join(gantt_lines)
+    async def lines():
+        for line in invalid:
+            yield dumps(line) + b"\n"
+        async for line in generate_batch(projects, settings.BATCH_CONCURRENCY, settings.BATCH_CHUNK_SIZE,
+                                         settings.BATCH_FLUSH_SECONDS, full=full):
+            yield dumps(line) + b"\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/tasks/{task_id}/downstream")
+async def get_task_downstream(task_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Retourne les tâches impactées (directement ou transitivement) par une tâche
+    """
+    task = await db.get(Task, task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    return {
+        "task_id": task_id,
+        "predecessors": await get_predecessor_ids(db, task_id),
+        "successors": await get_successor_ids(db, task_id),
+        "downstream": await get_downstream_ids(db, task_id)
+    }
 
 
 @router.patch("/tasks/{task_id}/status")
-async def update_task_status(task_id: int, status: str, db: Session = Depends(get_db)):
+async def update_task_status(task_id: int, status: str, db: AsyncSession = Depends(get_async_db)):
     """
     Met à jour le statut d'une tâche
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
     if status not in ['todo', 'in_progress', 'done']:
         raise HTTPException(status_code=400, detail="Invalid status")
     
-    task.status = status
-    db.commit()
-    db.refresh(task)
+    # Replanifier uniquement le cône aval si le statut change réellement
+    schedule_changes = []
+    if task.status != status:
+        task.status = status
+        await db.flush()
+        schedule_changes = await reschedule_downstream(db, task_id)
+    await db.commit()
+    response_cache.invalidate_project(task.project_id)
     
     return {
         "success": True,
@@ -202,5 +184,6 @@ async def update_task_status(task_id: int, status: str, db: Session = Depends(ge
             "id": task.id,
             "title": task.title,
             "status": task.status
-        }
+        },
+        "schedule_changes": schedule_changes
     }
@@ -0,0 +1,84 @@
+# backend/app/api/routes/jobs.py
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+import asyncio
+import json
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, get_async_db
+from app.models.job import Job
+from app.schemas.project import ProjectCreate
+from app.services.job_queue import TERMINAL_STATUSES, job_queue, job_to_dict
+from app.services.project_generation import generate_project_job
+
+router = APIRouter()
+
+job_queue.register("generate_project", generate_project_job)
+
+
+@router.post("/generate-project", status_code=202)
+async def enqueue_project_generation(project_data: ProjectCreate):
+    """
+    Met en file la génération d'un projet et retourne immédiatement l'id du job
+    """
+    job = await job_queue.enqueue("generate_project", {
+        "name": project_data.name,
+        "description": project_data.description,
+        "start_date": project_data.start_date.isoformat() if isinstance(project_data.start_date, date) else project_data.start_date
+    })
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/jobs/{job.id}",
+        "events_url": f"/api/jobs/{job.id}/events"
+    }
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Statut d'un job (et son résultat une fois terminé)"""
+    job = await db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_to_dict(job)
+
+
+@router.post("/{job_id}/cancel")
+async def cancel_job(job_id: int):
+    """Annule un job en attente ou en cours"""
+    job = await job_queue.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != "cancelled":
+        raise HTTPException(status_code=409, detail=f"Job already {job.status}")
+    return job_to_dict(job)
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Server-sent events: un événement `status` à chaque changement, jusqu'à un état terminal
+    """
+    if not await db.get(Job, job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def events():
+        last = None
+        while True:
+            async with AsyncSessionLocal() as session:
+                job = await session.get(Job, job_id)
+                data = job_to_dict(job)
+            state = (data["status"], data["attempts"])
+            if state != last:
+                last = state
+                yield f"event: status\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+            if data["status"] in TERMINAL_STATUSES:
+                return
+            await asyncio.sleep(settings.JOB_POLL_INTERVAL_SECONDS / 2)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,34 @@
+# backend/app/api/routes/metrics.py
+from fastapi import APIRouter
+from app.services.generation_cache import generation_cache
+from app.services.single_flight import generation_flight
+from app.services.gemini_service import gemini_service
+from app.services.rate_limiter import rate_limiter
+from app.services.response_cache import response_cache
+
+router = APIRouter()
+
+@router.get("/generation-cache")
+async def get_generation_cache_stats():
+    """Compteurs du cache de génération (hits mémoire/persistant, misses, évictions)"""
+    return generation_cache.stats()
+
+@router.get("/single-flight")
+async def get_single_flight_stats():
+    """Appels d'agents: exécutions réelles vs appels rattachés à un calcul en cours"""
+    return generation_flight.stats()
+
+@router.get("/llm-provider")
+async def get_llm_provider_stats():
+    """Fournisseur LLM: requêtes, retries, erreurs et requêtes en cours"""
+    return gemini_service.provider.stats()
+
+@router.get("/rate-limiter")
+async def get_rate_limiter_stats():
+    """Quotas LLM: utilisation sur la dernière minute, budget disponible, files d'attente"""
+    return rate_limiter.stats()
+
+@router.get("/response-cache")
+async def get_response_cache_stats():
+    """Cache des réponses de lecture: hits, misses, 304 servis, invalidations"""
+    return response_cache.stats()
@@ -3,19 +3,26 @@
 Nouvelles routes pour la génération phasée
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Any, Optional
 from datetime import datetime, date
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.models.project import Project
-from app.models.task import Task
-from app.models.user_story import UserStory
 from app.schemas.project import ProjectCreate
 from app.agents.planner_agent import PlannerAgent
 from app.agents.scheduler_agent import SchedulerAgent
 from app.agents.backlog_agent import BacklogAgent
 from app.agents.tech_advisor_agent import TechAdvisorAgent
+from app.services.persistence import bulk_insert_tasks, bulk_insert_user_stories, bulk_update_task_dates
+from app.services.incremental_scheduler import load_schedule_inputs
+from app.services.schedule_engine import ScheduleCycleError
+from app.services.project_classifier import classify_project
+from app.services.project_generation import render_gantt_code
+from app.services.rate_limiter import llm_context
+from app.services.response_cache import response_cache
+from app.services.work_calendar import load_project_calendar
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,7 +30,7 @@ router = APIRouter()
 
 
 @router.post("/generate-tasks")
-async def generate_tasks_only(project_data: ProjectCreate, db: Session = Depends(get_db)):
+async def generate_tasks_only(project_data: ProjectCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Phase 1: Génère uniquement les tâches et les recommandations tech
     """
@@ -38,38 +45,24 @@ async def generate_tasks_only(project_data: ProjectCreate, db: Session = Depends
             status="active"
         )
         db.add(db_project)
-        db.commit()
-        db.refresh(db_project)
+        await db.commit()
+        await db.refresh(db_project)
+        response_cache.invalidate_project(db_project.id, listing=True)
         
-        # Générer les tâches avec le Planner Agent
+        # Générer les tâches (Planner Agent) et les recommandations tech en parallèle
         planner = PlannerAgent()
-        tasks_data = planner.generate_tasks(project_data.description)
-        
-        # Obtenir les recommandations tech
         tech_advisor = TechAdvisorAgent()
-        tech_recommendations = tech_advisor.recommend_stack(project_data.description)
-        
-        # Sauvegarder les tâches
-        tasks_list = []
-        for task_data in tasks_data:
-            db_task = Task(
-                project_id=db_project.id,
-                title=task_data.get("title", ""),
-                description=task_data.get("description", ""),
-                duration_days=task_data.get("duration_days", 1),
-                priority=task_data.get("priority", "medium"),
-                status="todo",
-                dependencies=task_data.get("dependencies", ""),
-                order=task_data.get("order", 0)
+        features = classify_project(project_data.description)
+        with llm_context(project=db_project.id):
+            tasks_data, tech_recommendations = await asyncio.gather(
+                planner.generate_tasks_async(project_data.description, features),
+                tech_advisor.recommend_stack_async(project_data.description, features)
             )
-            db.add(db_task)
-            tasks_list.append(db_task)
         
-        db.commit()
-        
-        # Rafraîchir pour obtenir les IDs
-        for task in tasks_list:
-            db.refresh(task)
+        # Sauvegarder les tâches (un seul INSERT ... RETURNING)
+        tasks_list = await bulk_insert_tasks(db, db_project.id, tasks_data, status="todo")
+        await db.commit()
+        response_cache.invalidate_project(db_project.id)
         
         return {
             "success": True,
@@ -105,7 +98,11 @@ async def generate_tasks_only(project_data: ProjectCreate, db: Session = Depends
 
 
 @router.post("/{project_id}/generate-gantt")
-async def generate_gantt(project_id: int, db: Session = Depends(get_db)):
+async def generate_gantt(
+    project_id: int,
+    workers: Optional[int] = Query(None, ge=1, description="Taille de l'équipe; absent = parallélisme illimité"),
+    db: AsyncSession = Depends(get_async_db)
+):
     """
     Phase 2: Génère le diagramme Gantt pour un projet existant
     """
@@ -113,57 +110,55 @@ async def generate_gantt(project_id: int, db: Session = Depends(get_db)):
     
     try:
         # Récupérer le projet et ses tâches
-        project = db.query(Project).filter(Project.id == project_id).first()
+        project = await db.get(Project, project_id)
         if not project:
             raise HTTPException(status_code=404, detail="Projet non trouvé")
         
-        tasks = db.query(Task).filter(Task.project_id == project_id).order_by(Task.order).all()
+        # Tâches et dépendances depuis la table d'arêtes (identifiants en base)
+        tasks, tasks_data = await load_schedule_inputs(db, project_id)
         if not tasks:
             raise HTTPException(status_code=400, detail="Aucune tâche à planifier")
+        calendar = await load_project_calendar(db, project_id)
         
         # Utiliser le Scheduler Agent
         scheduler = SchedulerAgent()
-        tasks_data = [
-            {
-                "id": t.id,
-                "title": t.title,
-                "duration_days": t.duration_days,
-                "dependencies": t.dependencies,
-                "priority": t.priority,
-                "status": t.status
-            }
-            for t in tasks
-        ]
-        
-        scheduled_tasks = scheduler.create_schedule(tasks_data, project.start_date)
-        
-        # Mettre à jour les dates dans la DB
-        for scheduled in scheduled_tasks:
-            task = db.query(Task).filter(Task.id == scheduled["id"]).first()
-            if task:
-                task.start_date = datetime.fromisoformat(scheduled["start_date"]).date()
-                task.end_date = datetime.fromisoformat(scheduled["end_date"]).date()
+        scheduled_tasks = await scheduler.create_schedule_async(
+            tasks_data, project.start_date, workers=workers, calendar=calendar
+        )
         
-        db.commit()
+        # Mettre à jour les dates dans la DB (un seul UPDATE à partir des tâches déjà chargées)
+        await bulk_update_task_dates(db, tasks, scheduled_tasks)
+        # Équipe retenue: la replanification après un changement de statut garde le même mode
+        project.schedule_workers = workers
+        await db.commit()
+        response_cache.invalidate_project(project_id)
         
         # Générer le code Gantt
-        gantt_code = generate_gantt_code(scheduled_tasks, project.name)
+        gantt_code = await render_gantt_code(scheduled_tasks, project.name, calendar.mermaid_excludes())
         
         return {
             "success": True,
             "phase": "gantt_generated",
+            "mode": "resources" if workers else "cpm",
             "gantt_code": gantt_code,
             "tasks": scheduled_tasks,
+            "critical_path": [t["id"] for t in scheduled_tasks if t["is_critical"]],
+            "project_duration": scheduler.calculate_project_duration(scheduled_tasks, calendar),
             "message": "✅ Diagramme Gantt généré avec succès!"
         }
         
+    except HTTPException:
+        raise
+    except ScheduleCycleError as e:
+        logger.error(f"❌ Erreur génération Gantt: {str(e)}")
+        raise HTTPException(status_code=400, detail={"message": str(e), "cycle": e.cycle})
     except Exception as e:
         logger.error(f"❌ Erreur génération Gantt: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur: {str(e)}")
 
 
 @router.post("/{project_id}/generate-backlog")
-async def generate_backlog(project_id: int, db: Session = Depends(get_db)):
+async def generate_backlog(project_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Phase 3: Génère les user stories pour un projet existant
     """
@@ -171,35 +166,19 @@ async def generate_backlog(project_id: int, db: Session = Depends(get_db)):
     
     try:
         # Récupérer le projet
-        project = db.query(Project).filter(Project.id == project_id).first()
+        project = await db.get(Project, project_id)
         if not project:
             raise HTTPException(status_code=404, detail="Projet non trouvé")
         
         # Utiliser le Backlog Agent
         backlog_agent = BacklogAgent()
-        user_stories_data = backlog_agent.generate_user_stories(project.description)
+        with llm_context(project=project.id):
+            user_stories_data = await backlog_agent.generate_user_stories_async(project.description)
         
-        # Sauvegarder les user stories
-        stories_list = []
-        for story_data in user_stories_data:
-            db_story = UserStory(
-                project_id=project.id,
-                title=story_data.get("title", ""),
-                description=story_data.get("description", ""),
-                points=story_data.get("points", 0),
-                priority=story_data.get("priority", "Should Have"),
-                status="todo",
-                sprint=story_data.get("sprint", 0),
-                acceptance_criteria=story_data.get("acceptance_criteria", "")
-            )
-            db.add(db_story)
-            stories_list.append(db_story)
-        
-        db.commit()
-        
-        # Rafraîchir
-        for story in stories_list:
-            db.refresh(story)
+        # Sauvegarder les user stories (un seul INSERT ... RETURNING)
+        stories_list = await bulk_insert_user_stories(db, project.id, user_stories_data, status="todo")
+        await db.commit()
+        response_cache.invalidate_project(project.id)
         
         return {
             "success": True,
@@ -223,22 +202,3 @@ async def generate_backlog(project_id: int, db: Session = Depends(get_db)):
     except Exception as e:
         logger.error(f"❌ Erreur génération Backlog: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur: {str(e)}")
-
-
-def generate_gantt_code(tasks: list, project_name: str) -> str:
-    """Génère le code Mermaid pour le diagramme de Gantt"""
-    gantt_lines = [
-        "gantt",
-        f"    title {project_name}",
-        "    dateFormat YYYY-MM-DD",
-        ""
-    ]
-    
-    for task in tasks:
-        status = "done" if task.get("status") == "done" else "active" if task.get("status") == "in_progress" else "crit"
-        start = task.get("start_date", "")
-        duration = task.get("duration_days", 1)
-        
-        gantt_lines.append(f"    {task.get('title', 'Task')} :{status}, {start}, {duration}d")
-    
-    return "\n".join(gantt_lines)
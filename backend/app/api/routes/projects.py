@@ -1,12 +1,43 @@
-﻿from fastapi import APIRouter, Depends, HTTPException
+﻿from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.database import get_db, get_read_db
 from app.models.project import Project
+from app.models.project_calendar import ProjectCalendar
+from app.models.task import Task
+from app.models.user_story import UserStory
 from app.schemas.project import Project as ProjectSchema, ProjectCreate, ProjectUpdate
+from app.schemas.calendar import ProjectCalendar as ProjectCalendarSchema, ProjectCalendarUpdate
+from app.services.pagination import keyset_page, parse_fields
+from app.services.response_cache import PROJECTS_SCOPE, project_scope, response_cache
+from app.services.work_calendar import calendar_from_model
 
 router = APIRouter()
 
+# Pages des listes: curseur de la page suivante dans cet en-tête (absent sur la dernière page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Clés de tri des listes (uniques, servies par les index composites des modèles)
+PROJECTS_ORDER = [Project.id]
+TASKS_ORDER = [Task.order, Task.id]
+USER_STORIES_ORDER = [UserStory.sprint, UserStory.id]
+# Sprint fixé par le filtre: l'id seul suffit (sinon SQLite trie la page dans un B-tree temporaire)
+SPRINT_STORIES_ORDER = [UserStory.id]
+
+
+def _page(db: Session, model, fields: Optional[str], order_by: list, filters: list,
+          cursor: Optional[str], limit: int) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """Lignes de la page et en-têtes de la réponse (curseur suivant)"""
+    try:
+        items, next_cursor = keyset_page(db, model, parse_fields(fields, model), order_by, filters, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return items, ({NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {})
+
+
+def _ensure_project(db: Session, project_id: int) -> None:
+    if db.query(Project.id).filter(Project.id == project_id).first() is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
 @router.post("/projects", response_model=ProjectSchema)
 def create_project(project: ProjectCreate, db: Session = Depends(get_db)):
     """Créer un nouveau projet"""
@@ -14,21 +45,88 @@ def create_project(project: ProjectCreate, db: Session = Depends(get_db)):
     db.add(db_project)
     db.commit()
     db.refresh(db_project)
+    response_cache.invalidate_project(db_project.id, listing=True)
     return db_project
 
-@router.get("/projects", response_model=List[ProjectSchema])
-def get_projects(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Récupérer tous les projets"""
-    projects = db.query(Project).offset(skip).limit(limit).all()
-    return projects
+@router.get("/projects")
+def get_projects(
+    request: Request,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description=f"Curseur de l'en-tête {NEXT_CURSOR_HEADER} de la page précédente"),
+    status: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Colonnes à retourner, ex: id,name,status"),
+    db: Session = Depends(get_read_db)
+):
+    """Récupérer les projets, par pages (pagination par clé sur l'id)"""
+    filters = [Project.status == status] if status else []
+    return response_cache.respond(
+        request, PROJECTS_SCOPE,
+        lambda: _page(db, Project, fields, PROJECTS_ORDER, filters, cursor, limit)
+    )
 
 @router.get("/projects/{project_id}", response_model=ProjectSchema)
-def get_project(project_id: int, db: Session = Depends(get_db)):
+def get_project(project_id: int, request: Request, db: Session = Depends(get_read_db)):
     """Récupérer un projet par ID"""
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if project is None:
-        raise HTTPException(status_code=404, detail="Project not found")
-    return project
+    def render():
+        project = db.query(Project).filter(Project.id == project_id).first()
+        if project is None:
+            raise HTTPException(status_code=404, detail="Project not found")
+        return ProjectSchema.model_validate(project).model_dump(mode="json"), {}
+
+    return response_cache.respond(request, project_scope(project_id), render)
+
+@router.get("/projects/{project_id}/tasks")
+def get_project_tasks(
+    project_id: int,
+    request: Request,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Colonnes à retourner, ex: id,title,status,start_date"),
+    db: Session = Depends(get_read_db)
+):
+    """Tâches d'un projet dans l'ordre du plan, par pages (clé: order, id)"""
+    filters = [Task.project_id == project_id]
+    if status:
+        filters.append(Task.status == status)
+    if priority:
+        filters.append(Task.priority == priority)
+
+    def render():
+        _ensure_project(db, project_id)
+        return _page(db, Task, fields, TASKS_ORDER, filters, cursor, limit)
+
+    return response_cache.respond(request, project_scope(project_id), render)
+
+@router.get("/projects/{project_id}/user-stories")
+def get_project_user_stories(
+    project_id: int,
+    request: Request,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    sprint: Optional[int] = None,
+    fields: Optional[str] = Query(None, description="Colonnes à retourner, ex: id,title,points,sprint"),
+    db: Session = Depends(get_read_db)
+):
+    """User stories d'un projet par sprint, par pages (clé: sprint, id)"""
+    filters = [UserStory.project_id == project_id]
+    if status:
+        filters.append(UserStory.status == status)
+    if priority:
+        filters.append(UserStory.priority == priority)
+    order_by = USER_STORIES_ORDER
+    if sprint is not None:
+        filters.append(UserStory.sprint == sprint)
+        order_by = SPRINT_STORIES_ORDER
+
+    def render():
+        _ensure_project(db, project_id)
+        return _page(db, UserStory, fields, order_by, filters, cursor, limit)
+
+    return response_cache.respond(request, project_scope(project_id), render)
 
 @router.put("/projects/{project_id}", response_model=ProjectSchema)
 def update_project(project_id: int, project: ProjectUpdate, db: Session = Depends(get_db)):
@@ -42,6 +140,7 @@ def update_project(project_id: int, project: ProjectUpdate, db: Session = Depend
     
     db.commit()
     db.refresh(db_project)
+    response_cache.invalidate_project(project_id, listing=True)
     return db_project
 
 @router.delete("/projects/{project_id}")
@@ -53,4 +152,33 @@ def delete_project(project_id: int, db: Session = Depends(get_db)):
     
     db.delete(db_project)
     db.commit()
-    return {"message": "Project deleted successfully"}
\ No newline at end of file
+    response_cache.invalidate_project(project_id, listing=True)
+    return {"message": "Project deleted successfully"}
+
+@router.get("/projects/{project_id}/calendar", response_model=ProjectCalendarSchema)
+def get_project_calendar(project_id: int, request: Request, db: Session = Depends(get_read_db)):
+    """Récupérer le calendrier ouvré d'un projet (calendrier par défaut s'il n'est pas défini)"""
+    def render():
+        _ensure_project(db, project_id)
+        calendar = calendar_from_model(db.get(ProjectCalendar, project_id))
+        return ProjectCalendarSchema(
+            project_id=project_id,
+            working_weekdays=sorted(calendar.working_weekdays),
+            holidays=sorted(calendar.holidays)
+        ).model_dump(mode="json"), {}
+
+    return response_cache.respond(request, project_scope(project_id), render)
+
+@router.put("/projects/{project_id}/calendar", response_model=ProjectCalendarSchema)
+def update_project_calendar(project_id: int, calendar: ProjectCalendarUpdate, db: Session = Depends(get_db)):
+    """Définir le calendrier ouvré d'un projet (pris en compte au prochain /generate-gantt)"""
+    if db.query(Project).filter(Project.id == project_id).first() is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    db_calendar = db.get(ProjectCalendar, project_id) or ProjectCalendar(project_id=project_id)
+    db_calendar.working_weekdays = ",".join(str(day) for day in calendar.working_weekdays)
+    db_calendar.holidays = ",".join(day.isoformat() for day in sorted(set(calendar.holidays)))
+    db.add(db_calendar)
+    db.commit()
+    response_cache.invalidate_project(project_id)
+    return ProjectCalendarSchema(project_id=project_id, **calendar.model_dump())
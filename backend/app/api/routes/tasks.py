@@ -1,13 +1,14 @@
 # backend/app/api/routes/tasks.py
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models.task import Task
+from app.services.response_cache import response_cache
 
 router = APIRouter()
 
 @router.get("/{task_id}")
-def get_task(task_id: int, db: Session = Depends(get_db)):
+def get_task(task_id: int, db: Session = Depends(get_read_db)):
     """Récupérer une tâche"""
     task = db.query(Task).filter(Task.id == task_id).first()
     if not task:
@@ -23,5 +24,6 @@ def update_task_status(task_id: int, status: str, db: Session = Depends(get_db))
     
     task.status = status
     db.commit()
+    response_cache.invalidate_project(task.project_id)
     db.refresh(task)
     return task
\ No newline at end of file
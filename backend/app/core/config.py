@@ -5,6 +5,19 @@ from typing import Optional
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./ai_pm_agent.db"
+    DATABASE_READ_URL: Optional[str] = None  # Réplica pour les routes GET (défaut: SQLite en lecture seule)
+    DB_POOL_SIZE: int = 10  # Bases serveur (PostgreSQL, MySQL)
+    DB_POOL_OVERFLOW: int = 20
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    
+    # SQLite: PRAGMA appliqués à chaque connexion (valeur vide = défaut SQLite)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_CACHE_SIZE_KIB: int = 65536
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_POOL_SIZE: int = 5
+    SQLITE_POOL_OVERFLOW: int = 5
     
     # Google Gemini API
     GEMINI_API_KEY: str
@@ -24,6 +37,49 @@ class Settings(BaseSettings):
     APP_PORT: Optional[str] = "8000"
     CORS_ORIGINS: Optional[str] = "http://localhost:3000"
     
+    # Agents
+    AGENT_TIMEOUT_SECONDS: float = 60.0  # Timeout par agent dans le coordinateur
+    BLOCKING_POOL_SIZE: int = 8  # Threads pour le travail bloquant (agents, I/O sync)
+    CPU_POOL_WORKERS: int = 0  # Processus pour le calcul des agents (0 = pool de threads)
+    CPU_POOL_MIN_ITEMS: int = 500  # Taille (tâches) à partir de laquelle planning et Gantt passent au pool de processus
+    
+    # Génération par lots (imports de portefeuille)
+    BATCH_MAX_PROJECTS: int = 1000
+    BATCH_CONCURRENCY: int = 8  # Projets générés simultanément
+    BATCH_CHUNK_SIZE: int = 25  # Projets persistés par transaction
+    BATCH_FLUSH_SECONDS: float = 0.5  # Persiste un paquet incomplet après ce délai sans résultat
+    
+    # Cache des générations (LRU mémoire + SQLite optionnel)
+    GENERATION_CACHE_SIZE: int = 512
+    GENERATION_CACHE_PATH: Optional[str] = None  # ex: ./generation_cache.db
+    GENERATION_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    GENERATION_CACHE_MAX_PERSISTENT: int = 10000
+    
+    # Cache des réponses des routes de lecture (ETag / GET conditionnel)
+    RESPONSE_CACHE_SIZE: int = 1024
+    RESPONSE_CACHE_TTL_SECONDS: float = 60.0  # Borne l'écart si la base est modifiée hors de ce processus
+    
+    # File de jobs (génération en arrière-plan)
+    JOB_WORKERS: int = 2  # Jobs exécutés en parallèle au maximum
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BASE_SECONDS: float = 2.0  # Backoff exponentiel avec jitter
+    JOB_RETRY_MAX_SECONDS: float = 60.0
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    
+    # Fournisseur LLM: "mock" (générateur local) ou "http" (API generateContent)
+    LLM_PROVIDER: str = "mock"
+    LLM_BASE_URL: str = "https://generativelanguage.googleapis.com"  # ou le stub: http://127.0.0.1:8081
+    LLM_MODEL: str = "gemini-pro"
+    LLM_MAX_CONCURRENCY: int = 8  # Requêtes simultanées et taille du pool de connexions
+    LLM_TIMEOUT_SECONDS: float = 30.0
+    LLM_MAX_RETRIES: int = 3
+    LLM_RETRY_BASE_SECONDS: float = 0.5
+    LLM_HTTP2: bool = True  # Si le paquet h2 est installé
+    LLM_REQUESTS_PER_MINUTE: int = 60  # Quotas du fournisseur (0 = illimité)
+    LLM_TOKENS_PER_MINUTE: int = 60000
+    LLM_RATE_BURST_SECONDS: Optional[float] = None  # Rafale max en secondes de quota (défaut: 60)
+    LLM_COMPLETION_TOKENS_ESTIMATE: int = 2000  # Tokens de réponse estimés par appel
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,24 +1,155 @@
-from sqlalchemy import create_engine
+import os
+from typing import Any, Dict, Optional
+from urllib.parse import quote
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool, StaticPool
 from .config import settings
 
-# Créer le moteur SQLite
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Nécessaire pour SQLite
-)
+# Drivers async équivalents aux URLs synchrones
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+def to_async_url(url: str) -> str:
+    """Convertit une URL SQLAlchemy synchrone vers son driver async"""
+    scheme, sep, rest = url.partition("://")
+    if "+" in scheme:
+        return url
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+def is_sqlite_file(url: str) -> bool:
+    return is_sqlite(url) and make_url(url).database not in (None, "", ":memory:")
+
+def read_only_sqlite_url(url: str) -> str:
+    """Même fichier SQLite, ouvert en lecture seule (URI `mode=ro`)"""
+    path = os.path.abspath(make_url(url).database)
+    return f"sqlite:///file:{quote(path)}?mode=ro&uri=true"
+
+def sqlite_pragmas(read_only: bool = False) -> Dict[str, Any]:
+    """PRAGMA appliqués à chaque nouvelle connexion SQLite (valeurs vides: défaut SQLite)"""
+    pragmas = {
+        # WAL: lectures concurrentes d'une écriture. Fixé par l'écrivain (persistant dans le fichier)
+        "journal_mode": None if read_only else settings.SQLITE_JOURNAL_MODE,
+        "query_only": "ON" if read_only else None,
+        # Désactivées par défaut dans SQLite: sans elles, ON DELETE CASCADE (task_dependencies) est ignoré
+        "foreign_keys": "ON",
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,  # Attend le verrou au lieu de "database is locked"
+        "synchronous": settings.SQLITE_SYNCHRONOUS,  # NORMAL suffit en WAL (pas de corruption possible)
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KIB,  # Négatif: taille en KiB
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+    }
+    return {name: value for name, value in pragmas.items() if value not in (None, "")}
+
+def _apply_sqlite_pragmas(dbapi_connection, _connection_record, read_only: bool = False) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas(read_only).items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+def _apply_sqlite_read_pragmas(dbapi_connection, connection_record) -> None:
+    _apply_sqlite_pragmas(dbapi_connection, connection_record, read_only=True)
+
+def engine_options(url: str, async_driver: bool = False) -> Dict[str, Any]:
+    """Options du moteur selon la base: pool, arguments de connexion"""
+    if is_sqlite(url):
+        if not is_sqlite_file(url):
+            # Base en mémoire: une seule connexion partagée, sinon chaque connexion a sa propre base
+            return {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+        if async_driver:
+            # aiosqlite: chaque connexion a son propre thread (non daemon); gardée en pool, elle empêche
+            # le processus de se terminer sans dispose(). Ouverture par session, les PRAGMA suivent
+            return {"poolclass": NullPool}
+        # Fichier SQLite: quelques connexions réutilisées (les PRAGMA ne sont appliqués qu'une fois
+        # par connexion); un seul écrivain à la fois de toute façon
+        return {
+            "poolclass": QueuePool,
+            "pool_size": settings.SQLITE_POOL_SIZE,
+            "max_overflow": settings.SQLITE_POOL_OVERFLOW,
+            "connect_args": {"check_same_thread": False},  # Nécessaire pour SQLite
+        }
+    # Serveur (PostgreSQL, MySQL): pool borné, connexions vérifiées et recyclées
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_POOL_OVERFLOW,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    }
+
+def build_engine(url: str, read_only: bool = False) -> Engine:
+    sync_engine = create_engine(url, **engine_options(url))
+    if is_sqlite(url):
+        event.listen(sync_engine, "connect", _apply_sqlite_read_pragmas if read_only else _apply_sqlite_pragmas)
+    return sync_engine
+
+def build_read_engine(primary: Engine) -> Engine:
+    """
+    Moteur des lectures: réplica (DATABASE_READ_URL), sinon connexions SQLite en lecture seule
+    sur le même fichier (en WAL, elles ne bloquent pas l'écrivain et voient chaque commit),
+    sinon le moteur principal
+    """
+    if settings.DATABASE_READ_URL:
+        return build_engine(settings.DATABASE_READ_URL, read_only=is_sqlite(settings.DATABASE_READ_URL))
+    if is_sqlite_file(settings.DATABASE_URL):
+        return build_engine(read_only_sqlite_url(settings.DATABASE_URL), read_only=True)
+    return primary
+
+def build_async_engine(url: str) -> AsyncEngine:
+    url = to_async_url(url)
+    engine_async = create_async_engine(url, **engine_options(url, async_driver=True))
+    if is_sqlite(url):
+        event.listen(engine_async.sync_engine, "connect", _apply_sqlite_pragmas)
+    return engine_async
+
+# Créer le moteur
+engine = build_engine(settings.DATABASE_URL)
+
+# Moteur async pour les routes async (agents, génération phasée)
+async_engine = build_async_engine(settings.DATABASE_URL)
+
+# Moteur des routes de lecture (GET), séparé des écritures de génération
+read_engine = build_read_engine(engine)
 
 # Créer la session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 # Base pour les modèles
 Base = declarative_base()
 
+def init_db():
+    """Crée les tables manquantes de tous les modèles (les migrations Alembic font le reste)"""
+    from app.models import job, project, project_calendar, task, task_dependency, user_story  # noqa: F401
+    Base.metadata.create_all(bind=engine)
+
 # Dependency pour obtenir la DB dans les routes
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Dependency des routes en lecture seule (réplica ou connexion SQLite en lecture seule)
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Dependency async pour les routes `async def`
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,106 @@
+# backend/app/core/executor.py
+"""
+Exécuteurs du travail bloquant appelé depuis les routes async:
+- pool de threads borné (I/O sync, petits calculs)
+- pool de processus optionnel (CPU_POOL_WORKERS > 0) pour les étapes de calcul pur Python
+  des agents, qui échappent ainsi au GIL. Fonctions, arguments et résultats doivent être
+  picklables (fonctions de module ou méthodes d'objets simples).
+"""
+import asyncio
+import functools
+import importlib
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+blocking_pool = ThreadPoolExecutor(
+    max_workers=settings.BLOCKING_POOL_SIZE,
+    thread_name_prefix="blocking"
+)
+
+# Modules importés à la création de chaque processus: le premier appel ne paie pas l'import
+CPU_WORKER_MODULES = (
+    "app.services.gemini_service",
+    "app.agents.scheduler_agent",
+    "app.agents.tech_advisor_agent",
+    "app.services.project_generation",
+)
+
+_cpu_pool: Optional[ProcessPoolExecutor] = None
+
+
+async def run_blocking(func: Callable, *args, **kwargs) -> Any:
+    """Exécute une fonction bloquante dans le pool sans bloquer la boucle d'événements"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(blocking_pool, functools.partial(func, *args, **kwargs))
+
+
+def _init_cpu_worker() -> None:
+    for module in CPU_WORKER_MODULES:
+        importlib.import_module(module)
+
+
+def _ping() -> bool:
+    return True
+
+
+def cpu_pool() -> Optional[ProcessPoolExecutor]:
+    """Pool de processus partagé, créé à la première utilisation (None si désactivé)"""
+    global _cpu_pool
+    if _cpu_pool is None and settings.CPU_POOL_WORKERS > 0:
+        # "spawn": pas de fork d'un processus qui a déjà des threads et une boucle d'événements
+        _cpu_pool = ProcessPoolExecutor(
+            max_workers=settings.CPU_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_cpu_worker
+        )
+    return _cpu_pool
+
+
+async def run_cpu(func: Callable, *args, **kwargs) -> Any:
+    """
+    Exécute un calcul pur dans le pool de processus, ou dans le pool de threads
+    si CPU_POOL_WORKERS vaut 0
+    """
+    global _cpu_pool
+    pool = cpu_pool()
+    if pool is None:
+        return await run_blocking(func, *args, **kwargs)
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(pool, functools.partial(func, *args, **kwargs))
+    except BrokenProcessPool:
+        # Processus tué (OOM...): le pool est recréé au prochain appel
+        logger.error("❌ Pool de processus cassé, il sera recréé")
+        if _cpu_pool is pool:
+            _cpu_pool = None
+        raise
+
+
+async def run_cpu_for(size: int, func: Callable, *args, **kwargs) -> Any:
+    """run_cpu pour les gros volumes (>= CPU_POOL_MIN_ITEMS), sinon pool de threads (pas d'aller-retour pickle)"""
+    if size >= settings.CPU_POOL_MIN_ITEMS:
+        return await run_cpu(func, *args, **kwargs)
+    return await run_blocking(func, *args, **kwargs)
+
+
+async def start_cpu_pool() -> None:
+    """Démarre et réchauffe tous les processus du pool (imports faits avant la première requête)"""
+    pool = cpu_pool()
+    if pool is None:
+        return
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(loop.run_in_executor(pool, _ping) for _ in range(settings.CPU_POOL_WORKERS)))
+    logger.info(f"🧮 Pool de processus: {settings.CPU_POOL_WORKERS} workers prêts")
+
+
+def shutdown_cpu_pool() -> None:
+    global _cpu_pool
+    if _cpu_pool is not None:
+        _cpu_pool.shutdown(wait=True, cancel_futures=True)
+        _cpu_pool = None
@@ -0,0 +1,23 @@
+# backend/app/core/responses.py
+"""
+Réponses JSON sérialisées par pydantic-core (Rust): un modèle de réponse est écrit
+directement en bytes, sans passer par jsonable_encoder ni le module json.
+"""
+from typing import Any
+import pydantic_core
+from fastapi.responses import JSONResponse
+
+
+def dumps(content: Any) -> bytes:
+    """JSON d'un modèle pydantic ou de données simples (dates en ISO, types inconnus via str)"""
+    return pydantic_core.to_json(content, fallback=str)
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    JSONResponse dont le rendu passe par pydantic-core. À retourner directement depuis
+    la route (un `response_model` déclaré ne sert alors qu'à la documentation OpenAPI).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,4 +1,4 @@
-﻿from sqlalchemy import Column, Integer, String, Text, Date, DateTime
+﻿from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -6,14 +6,22 @@ from app.core.database import Base
 class Project(Base):
     __tablename__ = "projects"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     start_date = Column(Date, nullable=False)
     status = Column(String(50), default="active")
+    schedule_workers = Column(Integer, nullable=True)  # Équipe du dernier Gantt nivelé (NULL: CPM sans limite)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relations
     tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
-    user_stories = relationship("UserStory", back_populates="project", cascade="all, delete-orphan")
\ No newline at end of file
+    user_stories = relationship("UserStory", back_populates="project", cascade="all, delete-orphan")
+    task_dependencies = relationship("TaskDependency", cascade="all, delete-orphan")
+    calendar = relationship("ProjectCalendar", uselist=False, cascade="all, delete-orphan")
+    
+    # Liste paginée par id, filtrée par statut
+    __table_args__ = (
+        Index("ix_projects_status", "status", "id"),
+    )
\ No newline at end of file
@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from app.core.database import Base
+
+class ProjectCalendar(Base):
+    __tablename__ = "project_calendars"
+    
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    working_weekdays = Column(String(20), nullable=False, default="0,1,2,3,4")  # 0 = lundi
+    holidays = Column(Text, nullable=True)  # Dates ISO séparées par des virgules
@@ -1,11 +1,11 @@
-from sqlalchemy import Column, Integer, String, Text, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Date, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 class Task(Base):
     __tablename__ = "tasks"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
@@ -14,8 +14,15 @@ class Task(Base):
     end_date = Column(Date, nullable=True)
     priority = Column(String(50), default="medium")  # low, medium, high
     status = Column(String(50), default="todo")  # todo, in_progress, done
-    dependencies = Column(Text, nullable=True)  # Comma-separated task IDs
-    order = Column(Integer, default=0)
+    dependencies = Column(Text, nullable=True)  # Comma-separated task IDs (as generated, see task_dependencies)
+    order = Column(Integer, nullable=False, default=0)
     
     # Relations
     project = relationship("Project", back_populates="tasks")
+    
+    # Listes paginées par (order, id) dans un projet, avec ou sans filtre
+    __table_args__ = (
+        Index("ix_tasks_project_order", "project_id", "order", "id"),
+        Index("ix_tasks_project_status_order", "project_id", "status", "order", "id"),
+        Index("ix_tasks_project_priority_order", "project_id", "priority", "order", "id"),
+    )
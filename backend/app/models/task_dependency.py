@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, ForeignKey, Index
+from app.core.database import Base
+
+class TaskDependency(Base):
+    __tablename__ = "task_dependencies"
+    
+    # Arête "task_id dépend de depends_on_id"; la clé primaire couvre (task_id, depends_on_id)
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    depends_on_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    __table_args__ = (
+        # Sens inverse: "quelles tâches dépendent de X"
+        Index("ix_task_dependencies_depends_on_task", "depends_on_id", "task_id"),
+    )
@@ -0,0 +1,25 @@
+from pydantic import BaseModel, ConfigDict, field_validator
+from datetime import date
+from typing import List
+
+# Calendrier ouvré d'un projet (0 = lundi ... 6 = dimanche)
+class ProjectCalendarBase(BaseModel):
+    working_weekdays: List[int] = [0, 1, 2, 3, 4]
+    holidays: List[date] = []
+
+    @field_validator("working_weekdays")
+    @classmethod
+    def check_weekdays(cls, value: List[int]) -> List[int]:
+        if not value or any(day < 0 or day > 6 for day in value):
+            raise ValueError("working_weekdays doit contenir des jours entre 0 (lundi) et 6 (dimanche)")
+        return sorted(set(value))
+
+# Schéma pour la mise à jour
+class ProjectCalendarUpdate(ProjectCalendarBase):
+    pass
+
+# Schéma de réponse
+class ProjectCalendar(ProjectCalendarBase):
+    project_id: int
+
+    model_config = ConfigDict(from_attributes=True)
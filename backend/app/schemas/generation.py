@@ -0,0 +1,81 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+# Schémas de réponse des générations (/generate, /generate/stream, /generate-batch, jobs)
+# Construits directement depuis les lignes ORM insérées (from_attributes) et sérialisés
+# par pydantic-core: pas de dict intermédiaire ni de jsonable_encoder
+
+class GeneratedProject(BaseModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+    start_date: date
+    created_at: Optional[datetime] = None
+    status: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class GeneratedTask(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+    duration_days: int
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    priority: Optional[str] = None
+    status: Optional[str] = None
+    dependencies: Optional[str] = None
+    order: Optional[int] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class GeneratedUserStory(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+    points: Optional[int] = None
+    priority: Optional[str] = None
+    status: Optional[str] = None
+    sprint: Optional[int] = None
+    acceptance_criteria: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class AgentUsage(BaseModel):
+    name: str
+    status: str
+
+# Réponse complète d'une génération
+class GeneratedProjectResponse(BaseModel):
+    success: bool = True
+    project: GeneratedProject
+    tasks: List[GeneratedTask]
+    user_stories: List[GeneratedUserStory]
+    gantt_code: str
+    tech_recommendations: Dict[str, Any]
+    metrics: Dict[str, Any] = {}
+    agents_used: List[AgentUsage] = []
+
+    model_config = ConfigDict(from_attributes=True)
+
+# Lignes du flux NDJSON de /generate-batch
+class BatchLine(BaseModel):
+    index: int
+    status: str = "ok"
+
+class BatchProjectSummary(BatchLine):
+    project: GeneratedProject
+    tasks_count: int
+    user_stories_count: int
+    project_type: Optional[str] = None
+    metrics: Dict[str, Any] = {}
+    agents_used: List[AgentUsage] = []
+
+class BatchError(BatchLine):
+    status: str = "error"
+    error: Any
+
+# Champs de BatchLine en tête (index, status), puis la réponse complète
+class BatchProjectResult(GeneratedProjectResponse, BatchLine):
+    pass
@@ -0,0 +1,79 @@
+# backend/app/services/dependencies.py
+"""
+Accès au graphe de dépendances normalisé (table task_dependencies)
+"""
+from typing import Any, Dict, Iterable, List, Tuple
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.task_dependency import TaskDependency
+from app.services.schedule_engine import parse_dependencies
+
+
+def resolve_edges(local_ids: Iterable[Any], dependencies: Iterable[Any], db_ids: Iterable[int]) -> List[Tuple[int, int]]:
+    """
+    Traduit les dépendances exprimées en identifiants locaux (ceux produits par le Planner,
+    égaux à `order + 1`) en arêtes (task_id, depends_on_id) sur les identifiants en base
+    """
+    local_ids, dependencies, db_ids = list(local_ids), list(dependencies), list(db_ids)
+    by_local_id = {str(local_id): db_id for local_id, db_id in zip(local_ids, db_ids)}
+    edges = []
+    for db_id, value in zip(db_ids, dependencies):
+        seen = set()
+        for dep_id in parse_dependencies(value):
+            depends_on_id = by_local_id.get(dep_id)
+            if depends_on_id is not None and depends_on_id != db_id and depends_on_id not in seen:
+                seen.add(depends_on_id)
+                edges.append((db_id, depends_on_id))
+    return edges
+
+
+async def insert_task_dependencies(db: AsyncSession, project_id: int, edges: List[Tuple[int, int]]) -> None:
+    """Insère les arêtes en un seul INSERT executemany"""
+    if edges:
+        await db.execute(
+            insert(TaskDependency),
+            [{"task_id": task_id, "depends_on_id": depends_on_id, "project_id": project_id}
+             for task_id, depends_on_id in edges]
+        )
+
+
+async def get_predecessor_ids(db: AsyncSession, task_id: int) -> List[int]:
+    """Tâches dont `task_id` dépend directement"""
+    result = await db.scalars(select(TaskDependency.depends_on_id).where(TaskDependency.task_id == task_id))
+    return list(result.all())
+
+
+async def get_successor_ids(db: AsyncSession, task_id: int) -> List[int]:
+    """Tâches qui dépendent directement de `task_id`"""
+    result = await db.scalars(select(TaskDependency.task_id).where(TaskDependency.depends_on_id == task_id))
+    return list(result.all())
+
+
+def downstream_cte(task_id: int):
+    """CTE récursive des successeurs transitifs de `task_id` (colonne `id`), via l'index inverse"""
+    downstream = (
+        select(TaskDependency.task_id.label("id"))
+        .where(TaskDependency.depends_on_id == task_id)
+        .cte("downstream", recursive=True)
+    )
+    return downstream.union(
+        select(TaskDependency.task_id).join(downstream, TaskDependency.depends_on_id == downstream.c.id)
+    )
+
+
+async def get_downstream_ids(db: AsyncSession, task_id: int) -> List[int]:
+    """Cône aval de `task_id` (successeurs transitifs)"""
+    downstream = downstream_cte(task_id)
+    result = await db.scalars(select(downstream.c.id))
+    return list(result.all())
+
+
+async def load_project_predecessors(db: AsyncSession, project_id: int) -> Dict[int, List[int]]:
+    """Prédécesseurs de chaque tâche du projet, en une requête"""
+    predecessors: Dict[int, List[int]] = {}
+    result = await db.execute(
+        select(TaskDependency.task_id, TaskDependency.depends_on_id).where(TaskDependency.project_id == project_id)
+    )
+    for task_id, depends_on_id in result:
+        predecessors.setdefault(task_id, []).append(depends_on_id)
+    return predecessors
@@ -3,35 +3,166 @@
 
 import os
 from dotenv import load_dotenv
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Optional
 import json
+from app.core.config import settings
+from app.services.generation_cache import generation_cache
+from app.services.llm_provider import build_provider
+from app.services.project_classifier import ProjectFeatures, classify_project
 
 load_dotenv()
 
 # Mock implementation that generates reasonable default data
 class GeminiService:
+    # Fait partie de la clé de cache: à incrémenter quand le prompt ou le modèle change
+    PROMPT_VERSION = "1"
+    
+    TASKS_PROMPT = (
+        "Tu es un chef de projet. Découpe ce projet en 15 à 20 tâches. Réponds uniquement par un tableau JSON "
+        "d'objets {{id, title, description, duration_days, priority (high|medium|low), dependencies "
+        "(ids séparés par des virgules), status: \"todo\", order}}.\nProjet: {description}"
+    )
+    STORIES_PROMPT = (
+        "Tu es un Product Owner. Rédige 10 à 15 User Stories pour ce projet. Réponds uniquement par un tableau JSON "
+        "d'objets {{title, description, points, priority (Must Have|Should Have|Could Have), status: \"todo\", "
+        "sprint, acceptance_criteria}}.\nProjet: {description}"
+    )
+    
     def __init__(self):
         self.api_key = os.getenv("GEMINI_API_KEY")
-        print("⚠️  Using MOCK Gemini Service (Python 3.14 compatibility mode)")
-        print("📝 Real AI generation will be available when google-generativeai supports Python 3.14")
+        # Fonctions de module (picklables): exécutables dans le pool de processus
+        self.provider = build_provider({"planner": generate_tasks_local, "backlog": generate_user_stories_local})
+        if self.provider.name == "mock":
+            print("⚠️  Using MOCK Gemini Service (Python 3.14 compatibility mode)")
+            print("📝 Real AI generation will be available when google-generativeai supports Python 3.14")
+    
+    @property
+    def model_version(self) -> str:
+        model = "mock" if self.provider.name == "mock" else settings.LLM_MODEL
+        return f"{model}:{self.PROMPT_VERSION}"
+    
+    def cache_key(self, agent: str, project_description: str) -> str:
+        """Clé de cache / single-flight d'une génération"""
+        return generation_cache.make_key(agent, project_description, self.model_version)
+    
+    def _cached(self, agent: str, project_description: str, generate,
+                features: Optional[ProjectFeatures] = None) -> List[Dict[str, Any]]:
+        """Sert depuis le cache de génération, ou génère puis met en cache"""
+        key = self.cache_key(agent, project_description)
+        cached = generation_cache.get(key)
+        if cached is not None:
+            return cached
+        result = generate(project_description, features)
+        generation_cache.set(key, result)
+        return result
+    
+    async def _cached_async(self, agent: str, project_description: str, prompt: str,
+                            features: Optional[ProjectFeatures] = None) -> List[Dict[str, Any]]:
+        """Comme _cached, mais la génération passe par le fournisseur LLM configuré"""
+        key = self.cache_key(agent, project_description)
+        cached = generation_cache.get(key)
+        if cached is not None:
+            return cached
+        result = await self.provider.generate_json(agent, project_description, prompt, features=features)
+        if not isinstance(result, list) or not all(isinstance(item, dict) for item in result):
+            raise ValueError(f"Réponse du fournisseur invalide pour {agent}: liste d'objets attendue")
+        generation_cache.set(key, result)
+        return result
+    
+    async def _stream_cached(self, agent: str, project_description: str, prompt: str,
+                             features: Optional[ProjectFeatures] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Comme _cached_async, élément par élément dès qu'il est parsé; mis en cache une fois
+        la réponse complète (pas de single-flight: les éléments partent au fil de l'eau)
+        """
+        key = self.cache_key(agent, project_description)
+        cached = generation_cache.get(key)
+        if cached is not None:
+            for item in cached:
+                yield item
+            return
+        items = []
+        async for item in self.provider.stream_json_items(agent, project_description, prompt, features=features):
+            if not isinstance(item, dict):
+                raise ValueError(f"Réponse du fournisseur invalide pour {agent}: liste d'objets attendue")
+            items.append(item)
+            yield item
+        generation_cache.set(key, items)
+    
+    async def stream_tasks_async(self, project_description: str,
+                                 features: Optional[ProjectFeatures] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Tâches via le fournisseur LLM, une par une (avec cache)"""
+        prompt = self.TASKS_PROMPT.format(description=project_description)
+        i = 0
+        async for task in self._stream_cached("planner", project_description, prompt, features):
+            task.setdefault("id", i + 1)
+            task.setdefault("order", i)
+            i += 1
+            yield task
+    
+    async def stream_user_stories_async(self, project_description: str,
+                                        features: Optional[ProjectFeatures] = None) -> AsyncIterator[Dict[str, Any]]:
+        """User Stories via le fournisseur LLM, une par une (avec cache)"""
+        prompt = self.STORIES_PROMPT.format(description=project_description)
+        async for story in self._stream_cached("backlog", project_description, prompt, features):
+            yield story
+    
+    async def generate_tasks_async(self, project_description: str,
+                                   features: Optional[ProjectFeatures] = None) -> List[Dict[str, Any]]:
+        """
+        Génère des tâches via le fournisseur LLM (avec cache)
+        """
+        tasks = await self._cached_async(
+            "planner", project_description, self.TASKS_PROMPT.format(description=project_description), features
+        )
+        for i, task in enumerate(tasks):
+            task.setdefault("id", i + 1)
+            task.setdefault("order", i)
+        return tasks
     
-    def generate_tasks(self, project_description: str) -> List[Dict[str, Any]]:
+    async def generate_user_stories_async(self, project_description: str,
+                                          features: Optional[ProjectFeatures] = None) -> List[Dict[str, Any]]:
+        """
+        Génère des User Stories via le fournisseur LLM (avec cache)
+        """
+        return await self._cached_async(
+            "backlog", project_description, self.STORIES_PROMPT.format(description=project_description), features
+        )
+    
+    def generate_tasks(self, project_description: str,
+                       features: Optional[ProjectFeatures] = None) -> List[Dict[str, Any]]:
+        """
+        Génère des tâches basées sur la description du projet (avec cache).
+        Chemin synchrone: toujours le générateur local, voir generate_tasks_async.
+        """
+        return self._cached("planner", project_description, self._generate_tasks, features)
+    
+    def generate_user_stories(self, project_description: str,
+                              features: Optional[ProjectFeatures] = None) -> List[Dict[str, Any]]:
+        """
+        Génère des User Stories basées sur la description (avec cache).
+        Chemin synchrone: toujours le générateur local, voir generate_user_stories_async.
+        """
+        return self._cached("backlog", project_description, self._generate_user_stories, features)
+    
+    def _generate_tasks(self, project_description: str,
+                        features: Optional[ProjectFeatures] = None) -> List[Dict[str, Any]]:
         """
         Génère des tâches basées sur la description du projet
         """
-        # Analyse de la description pour personnaliser
-        desc_lower = project_description.lower()
+        # Analyse de la description pour personnaliser (une passe, partagée entre agents)
+        features = features or classify_project(project_description)
         
         tasks = []
         task_id = 1
         
         # Détecter le type de projet
-        is_web = any(word in desc_lower for word in ['site', 'web', 'application', 'frontend', 'backend', 'api'])
-        is_ecommerce = any(word in desc_lower for word in ['e-commerce', 'ecommerce', 'boutique', 'panier', 'paiement', 'stripe', 'paypal'])
-        is_mobile = any(word in desc_lower for word in ['mobile', 'ios', 'android', 'app mobile'])
-        is_data = any(word in desc_lower for word in ['data', 'donnée', 'analyse', 'dashboard', 'visualisation'])
-        has_auth = any(word in desc_lower for word in ['authentification', 'login', 'utilisateur', 'compte'])
-        has_admin = any(word in desc_lower for word in ['admin', 'administration', 'gestion'])
+        is_web = features.has("planner", "web")
+        is_ecommerce = features.has("planner", "ecommerce")
+        is_mobile = features.has("planner", "mobile")
+        is_data = features.has("planner", "data")
+        has_auth = features.has("planner", "auth")
+        has_admin = features.has("planner", "admin")
         
         # Phase 1: Planification
         tasks.append({
@@ -265,17 +396,18 @@ class GeminiService:
         
         return tasks
     
-    def generate_user_stories(self, project_description: str) -> List[Dict[str, Any]]:
+    def _generate_user_stories(self, project_description: str,
+                               features: Optional[ProjectFeatures] = None) -> List[Dict[str, Any]]:
         """
         Génère des User Stories basées sur la description
         """
-        desc_lower = project_description.lower()
+        features = features or classify_project(project_description)
         
         # Détection des types de projets
-        is_ecommerce = any(word in desc_lower for word in ['e-commerce', 'ecommerce', 'boutique', 'panier', 'paiement'])
-        has_users = any(word in desc_lower for word in ['utilisateur', 'user', 'compte', 'profil', 'login'])
-        has_admin = any(word in desc_lower for word in ['admin', 'administration', 'gestion'])
-        is_dashboard = any(word in desc_lower for word in ['dashboard', 'tableau de bord', 'visualisation', 'graphique'])
+        is_ecommerce = features.has("backlog", "ecommerce")
+        has_users = features.has("backlog", "users")
+        has_admin = features.has("backlog", "admin")
+        is_dashboard = features.has("backlog", "dashboard")
         
         stories = []
         story_id = 1
@@ -443,6 +575,19 @@ class GeminiService:
         """Fallback pour compatibilité"""
         return self.generate_user_stories("Projet générique")
 
+
+def generate_tasks_local(project_description: str,
+                         features: Optional[ProjectFeatures] = None) -> List[Dict[str, Any]]:
+    """Générateur local du Planner (sans cache)"""
+    return gemini_service._generate_tasks(project_description, features)
+
+
+def generate_user_stories_local(project_description: str,
+                                features: Optional[ProjectFeatures] = None) -> List[Dict[str, Any]]:
+    """Générateur local du Backlog (sans cache)"""
+    return gemini_service._generate_user_stories(project_description, features)
+
+
 # Instance globale
 gemini_service = GeminiService()
 
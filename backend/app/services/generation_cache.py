@@ -0,0 +1,132 @@
+# backend/app/services/generation_cache.py
+"""
+Cache adressé par contenu des résultats de génération des agents.
+Tier 1: LRU en mémoire. Tier 2 (optionnel): fichier SQLite avec TTL et éviction par taille.
+"""
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from app.core.config import settings
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_description(description: str) -> str:
+    """Forme canonique d'une description: NFC, espaces compactés"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", description or "")).strip()
+
+
+class GenerationCache:
+    def __init__(self, max_entries: int = 512, db_path: Optional[str] = None,
+                 ttl_seconds: int = 7 * 24 * 3600, max_persistent_entries: int = 10000):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_persistent_entries = max_persistent_entries
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "persistent_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS generation_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS ix_generation_cache_last_access ON generation_cache (last_access)")
+
+    @staticmethod
+    def make_key(agent: str, description: str, version: str) -> str:
+        """Clé = sha256(agent, description normalisée, version du prompt/modèle)"""
+        payload = json.dumps([agent, normalize_description(description), version], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Retourne une copie fraîche de la valeur (les appelants peuvent la modifier), ou None"""
+        with self._lock:
+            raw = self._memory.get(key)
+            if raw is not None:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return json.loads(raw)
+
+            if self._db is not None:
+                now = time.time()
+                row = self._db.execute(
+                    "SELECT value FROM generation_cache WHERE key = ? AND created_at >= ?",
+                    (key, now - self.ttl_seconds)
+                ).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE generation_cache SET last_access = ? WHERE key = ?", (now, key))
+                    self._remember(key, row[0])
+                    self._counters["persistent_hits"] += 1
+                    return json.loads(row[0])
+
+            self._counters["misses"] += 1
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        raw = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._remember(key, raw)
+            self._counters["writes"] += 1
+            if self._db is not None:
+                now = time.time()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO generation_cache (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                    (key, raw, now, now)
+                )
+                self._evict_persistent(now)
+
+    def _remember(self, key: str, raw: str) -> None:
+        self._memory[key] = raw
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _evict_persistent(self, now: float) -> None:
+        expired = self._db.execute("DELETE FROM generation_cache WHERE created_at < ?", (now - self.ttl_seconds,)).rowcount
+        overflow = self._db.execute("SELECT COUNT(*) FROM generation_cache").fetchone()[0] - self.max_persistent_entries
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM generation_cache WHERE key IN "
+                "(SELECT key FROM generation_cache ORDER BY last_access LIMIT ?)",
+                (overflow,)
+            )
+        self._counters["evictions"] += max(expired, 0) + max(overflow, 0)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM generation_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._counters["memory_hits"] + self._counters["persistent_hits"] + self._counters["misses"]
+            hits = lookups - self._counters["misses"]
+            stats = dict(self._counters)
+            stats.update({
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_capacity": self.max_entries,
+                "persistent": self._db is not None,
+            })
+            if self._db is not None:
+                stats["persistent_entries"] = self._db.execute("SELECT COUNT(*) FROM generation_cache").fetchone()[0]
+            return stats
+
+
+# Instance globale
+generation_cache = GenerationCache(
+    max_entries=settings.GENERATION_CACHE_SIZE,
+    db_path=settings.GENERATION_CACHE_PATH,
+    ttl_seconds=settings.GENERATION_CACHE_TTL_SECONDS,
+    max_persistent_entries=settings.GENERATION_CACHE_MAX_PERSISTENT,
+)
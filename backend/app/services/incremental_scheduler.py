@@ -0,0 +1,152 @@
+# backend/app/services/incremental_scheduler.py
+"""
+Replanification incrémentale: seul le cône aval d'une tâche modifiée est recalculé.
+Exception: un projet nivelé (/generate-gantt?workers=N) est replanifié en entier avec la même équipe.
+"""
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.agents.scheduler_agent import SchedulerAgent
+from app.models.project import Project
+from app.models.task import Task
+from app.models.task_dependency import TaskDependency
+from app.services.dependencies import downstream_cte, load_project_predecessors
+from app.services.persistence import bulk_update_task_dates
+from app.services.schedule_engine import DependencyGraph
+from app.services.work_calendar import WorkCalendar, load_project_calendar
+
+# Statuts dont les dates sont réelles et ne bougent plus avec les prédécesseurs
+PINNED_STATUSES = ("in_progress", "done")
+
+
+def _actual_dates(task: Task, planned_start: date, today: date, calendar: WorkCalendar):
+    """Dates de la tâche modifiée: démarrage ou fin réels à `today` selon le nouveau statut"""
+    duration = task.duration_days or 0
+    if task.status == "in_progress":
+        return today, calendar.add_working_days(today, duration)
+    if task.status == "done":
+        start = min(task.start_date or today, today)
+        return start, today
+    return planned_start, calendar.add_working_days(planned_start, duration)
+
+
+def _change(task: Task, start: date, end: date) -> Dict[str, Any]:
+    return {
+        "id": task.id,
+        "title": task.title,
+        "old_start_date": task.start_date.isoformat() if task.start_date else None,
+        "new_start_date": start.isoformat(),
+        "old_end_date": task.end_date.isoformat() if task.end_date else None,
+        "new_end_date": end.isoformat()
+    }
+
+
+async def load_schedule_inputs(db: AsyncSession, project_id: int) -> Tuple[List[Task], List[Dict[str, Any]]]:
+    """Tâches du projet (ordre du Planner) et entrées du Scheduler Agent"""
+    tasks = (await db.scalars(select(Task).where(Task.project_id == project_id).order_by(Task.order))).all()
+    predecessors = await load_project_predecessors(db, project_id)
+    tasks_data = [
+        {
+            "id": t.id,
+            "title": t.title,
+            "duration_days": t.duration_days,
+            "dependencies": predecessors.get(t.id, []),
+            "priority": t.priority,
+            "status": t.status
+        }
+        for t in tasks
+    ]
+    return tasks, tasks_data
+
+
+async def _reschedule_levelled(db: AsyncSession, project: Project, calendar: WorkCalendar) -> List[Dict[str, Any]]:
+    """
+    Replanification complète sous contrainte de ressources, comme /generate-gantt avec la même équipe.
+    Le cône aval ne suffit pas (une tâche décale aussi la suivante sur sa ressource) et les dates
+    réelles des tâches en cours/terminées ne sont pas figées dans ce mode.
+    """
+    tasks, tasks_data = await load_schedule_inputs(db, project.id)
+    scheduled = await SchedulerAgent().create_schedule_async(
+        tasks_data, project.start_date, workers=project.schedule_workers, calendar=calendar
+    )
+    tasks_by_id = {t.id: t for t in tasks}
+    changes = []
+    for scheduled_task in scheduled:
+        current = tasks_by_id[scheduled_task["id"]]
+        start = date.fromisoformat(scheduled_task["start_date"])
+        end = date.fromisoformat(scheduled_task["end_date"])
+        if start != current.start_date or end != current.end_date:
+            changes.append(_change(current, start, end))
+
+    await bulk_update_task_dates(db, tasks, scheduled)
+    return changes
+
+
+async def reschedule_downstream(db: AsyncSession, task_id: int, today: Optional[date] = None) -> List[Dict[str, Any]]:
+    """
+    Recalcule les dates de `task_id` et de ses successeurs transitifs, persiste les changements
+    et retourne le diff des dates. Le coût est proportionnel au cône aval, pas au projet
+    (sauf projet nivelé: replanification complète, voir `_reschedule_levelled`).
+    """
+    today = today or date.today()
+    task = await db.get(Task, task_id)
+    if task is None or task.start_date is None:
+        # Jamais planifiée: rien à propager (voir /generate-gantt)
+        return []
+
+    project = await db.get(Project, task.project_id)
+    calendar = await load_project_calendar(db, project.id)
+    if project.schedule_workers:
+        return await _reschedule_levelled(db, project, calendar)
+
+    # Cône = la tâche + ses successeurs transitifs, résolu côté SQL (pas de liste d'ids en paramètre)
+    downstream = downstream_cte(task_id)
+    in_cone = or_(Task.id == task_id, Task.id.in_(select(downstream.c.id)))
+    affected = {t.id: t for t in (await db.scalars(select(Task).where(in_cone))).all()}
+
+    # Arêtes entrantes du cône; les prédécesseurs hors du cône gardent leurs dates
+    edges = select(TaskDependency.task_id, TaskDependency.depends_on_id).where(
+        or_(TaskDependency.task_id == task_id, TaskDependency.task_id.in_(select(downstream.c.id)))
+    ).subquery()
+    predecessors: Dict[int, List[int]] = {}
+    end_dates: Dict[int, Optional[date]] = {}
+    for dependent_id, depends_on_id, depends_on_end in await db.execute(
+        select(edges.c.task_id, edges.c.depends_on_id, Task.end_date).join(Task, Task.id == edges.c.depends_on_id)
+    ):
+        predecessors.setdefault(dependent_id, []).append(depends_on_id)
+        if depends_on_id not in affected:
+            end_dates[depends_on_id] = depends_on_end
+
+    # Ordre topologique restreint au cône
+    graph = DependencyGraph.from_tasks([
+        {"id": t.id, "duration_days": t.duration_days,
+         "dependencies": [p for p in predecessors.get(t.id, []) if p in affected]}
+        for t in affected.values()
+    ])
+
+    scheduled = []
+    changes = []
+    for index in graph.topological_order():
+        current = affected[graph.ids[index]]
+        planned_start = project.start_date
+        for pred_id in predecessors.get(current.id, []):
+            pred_end = end_dates.get(pred_id)
+            if pred_end and pred_end > planned_start:
+                planned_start = pred_end
+        planned_start = calendar.next_working_day(planned_start)
+
+        if current.id == task_id:
+            start, end = _actual_dates(current, planned_start, today, calendar)
+        elif current.status in PINNED_STATUSES and current.start_date and current.end_date:
+            start, end = current.start_date, current.end_date
+        else:
+            start, end = planned_start, calendar.add_working_days(planned_start, current.duration_days or 0)
+
+        end_dates[current.id] = end
+        scheduled.append({"id": current.id, "start_date": start.isoformat(), "end_date": end.isoformat()})
+        if start != current.start_date or end != current.end_date:
+            changes.append(_change(current, start, end))
+
+    await bulk_update_task_dates(db, list(affected.values()), scheduled)
+    return changes
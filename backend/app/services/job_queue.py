@@ -0,0 +1,226 @@
+# backend/app/services/job_queue.py
+"""
+File de jobs persistante (table `jobs`) traitée par un pool borné de workers asyncio.
+Les jobs sont réclamés par un UPDATE ... RETURNING atomique, relancés avec backoff
+exponentiel + jitter en cas d'erreur, et annulables qu'ils soient en attente ou en cours.
+Hypothèse: un seul processus consomme la file (les jobs "running" orphelins sont remis
+en attente au démarrage).
+"""
+import asyncio
+import json
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+from sqlalchemy import select, update
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+TERMINAL_STATUSES = ("succeeded", "failed", "cancelled")
+
+
+def job_to_dict(job: Job) -> Dict[str, Any]:
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+        "run_after": job.run_after.isoformat() if job.run_after else None,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None
+    }
+
+
+def retry_delay(attempt: int, base: float, maximum: float) -> float:
+    """Backoff exponentiel plafonné, avec jitter (moitié fixe, moitié aléatoire)"""
+    delay = min(maximum, base * (2 ** (attempt - 1)))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class JobQueue:
+    def __init__(self, workers: int = 2, max_attempts: int = 3, retry_base: float = 2.0,
+                 retry_max: float = 60.0, poll_interval: float = 1.0):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.poll_interval = poll_interval
+        self._handlers: Dict[str, JobHandler] = {}
+        self._worker_tasks: List[asyncio.Task] = []
+        self._running_jobs: Dict[int, asyncio.Task] = {}
+        self._cancelled: Set[int] = set()  # Jobs en cours annulés par l'utilisateur
+        self._wake: Optional[asyncio.Event] = None
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        self._handlers[kind] = handler
+
+    async def enqueue(self, kind: str, payload: Dict[str, Any], max_attempts: Optional[int] = None) -> Job:
+        """Insère un job en attente et réveille un worker"""
+        if kind not in self._handlers:
+            raise ValueError(f"Type de job inconnu: {kind}")
+        now = datetime.utcnow()
+        job = Job(
+            kind=kind,
+            status="queued",
+            payload=json.dumps(payload, ensure_ascii=False, default=str),
+            attempts=0,
+            max_attempts=max_attempts or self.max_attempts,
+            run_after=now,
+            created_at=now
+        )
+        async with AsyncSessionLocal() as db:
+            db.add(job)
+            await db.commit()
+        if self._wake is not None:
+            self._wake.set()
+        return job
+
+    async def cancel(self, job_id: int) -> Optional[Job]:
+        """
+        Annule un job en attente ou en cours; retourne le job (None s'il n'existe pas).
+        Un job déjà terminé est retourné inchangé.
+        """
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status.in_(("queued", "running")))
+                .values(status="cancelled", finished_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            job = await db.get(Job, job_id)
+        running = self._running_jobs.get(job_id)
+        if running is not None and job is not None and job.status == "cancelled":
+            self._cancelled.add(job_id)
+            running.cancel()
+        return job
+
+    async def start(self) -> None:
+        if self._worker_tasks:
+            return
+        self._wake = asyncio.Event()
+        await self._recover()
+        self._worker_tasks = [asyncio.create_task(self._worker(n)) for n in range(self.workers)]
+        logger.info(f"🧵 Job queue: {self.workers} workers démarrés")
+
+    async def stop(self) -> None:
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    async def _recover(self) -> None:
+        """Remet en attente les jobs interrompus par un arrêt du processus"""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(Job).where(Job.status == "running")
+                .values(status="queued", run_after=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        if result.rowcount:
+            logger.warning(f"⚠️ Job queue: {result.rowcount} jobs interrompus remis en attente")
+
+    async def _claim(self) -> Optional[Any]:
+        """Passe atomiquement le prochain job prêt à "running" et le retourne"""
+        now = datetime.utcnow()
+        next_job = (
+            select(Job.id)
+            .where(Job.status == "queued", Job.run_after <= now)
+            .order_by(Job.run_after, Job.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)  # Ignoré par SQLite (écrivain unique)
+            .scalar_subquery()
+        )
+        async with AsyncSessionLocal() as db:
+            row = (await db.execute(
+                update(Job)
+                .where(Job.id == next_job, Job.status == "queued")
+                .values(status="running", attempts=Job.attempts + 1, started_at=now)
+                .returning(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts)
+                .execution_options(synchronize_session=False)
+            )).first()
+            await db.commit()
+        return row
+
+    async def _finish(self, job_id: int, **values) -> None:
+        # Seul un job encore "running" est mis à jour: une annulation concurrente l'emporte
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Job).where(Job.id == job_id, Job.status == "running").values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+    async def _worker(self, number: int) -> None:
+        while True:
+            try:
+                self._wake.clear()
+                job = await self._claim()
+            except Exception as e:
+                logger.error(f"❌ Job worker {number}: réclamation impossible: {e}")
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._execute(job)
+
+    async def _execute(self, job) -> None:
+        logger.info(f"▶️ Job {job.id} ({job.kind}): tentative {job.attempts}/{job.max_attempts}")
+        handler = self._handlers.get(job.kind)
+        task = asyncio.ensure_future(handler(json.loads(job.payload)) if handler else self._unknown(job.kind))
+        self._running_jobs[job.id] = task
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            # Arrêt du worker (qui annule aussi le handler attendu): le job sera repris au prochain démarrage
+            if job.id not in self._cancelled or asyncio.current_task().cancelling():
+                raise
+            logger.info(f"🛑 Job {job.id}: annulé")
+            return
+        except Exception as e:
+            now = datetime.utcnow()
+            if job.attempts < job.max_attempts:
+                delay = retry_delay(job.attempts, self.retry_base, self.retry_max)
+                logger.warning(f"🔁 Job {job.id}: échec ({e}), nouvel essai dans {delay:.1f}s")
+                await self._finish(job.id, status="queued", error=str(e), run_after=now + timedelta(seconds=delay))
+            else:
+                logger.error(f"❌ Job {job.id}: échec définitif après {job.attempts} tentatives: {e}")
+                await self._finish(job.id, status="failed", error=str(e), finished_at=now)
+            return
+        finally:
+            self._running_jobs.pop(job.id, None)
+            self._cancelled.discard(job.id)
+
+        await self._finish(
+            job.id,
+            status="succeeded",
+            result=json.dumps(result, ensure_ascii=False, default=str),
+            error=None,
+            finished_at=datetime.utcnow()
+        )
+        logger.info(f"✅ Job {job.id}: terminé")
+
+    async def _unknown(self, kind: str):
+        raise ValueError(f"Type de job inconnu: {kind}")
+
+
+# Instance globale, démarrée avec l'application
+job_queue = JobQueue(
+    workers=settings.JOB_WORKERS,
+    max_attempts=settings.JOB_MAX_ATTEMPTS,
+    retry_base=settings.JOB_RETRY_BASE_SECONDS,
+    retry_max=settings.JOB_RETRY_MAX_SECONDS,
+    poll_interval=settings.JOB_POLL_INTERVAL_SECONDS,
+)
@@ -0,0 +1,335 @@
+# backend/app/services/llm_provider.py
+"""
+Fournisseurs LLM derrière GeminiService.
+- MockProvider: générateur local par mots-clés (par défaut, hors ligne)
+- HTTPProvider: API type Gemini `generateContent` via un client httpx async partagé
+  (keep-alive, HTTP/2 si `h2` est installé), sémaphore de concurrence, timeouts et retries avec jitter;
+  `streamGenerateContent` pour produire les éléments du tableau JSON dès qu'ils sont parsés
+"""
+import asyncio
+import json
+from abc import ABC, abstractmethod
+import logging
+import random
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+import httpx
+from app.core.config import settings
+from app.core.executor import run_cpu
+from app.services.project_classifier import ProjectFeatures
+from app.services.rate_limiter import RateLimiter, estimate_tokens, rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Erreurs transitoires: on réessaie
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class JSONArrayStream:
+    """
+    Parseur incrémental d'un tableau JSON reçu par fragments: `feed` retourne les éléments
+    complétés par le fragment. Le texte avant le `[` (ex: balise markdown) est ignoré.
+    """
+
+    def __init__(self):
+        self._item: List[str] = []
+        self._depth = 0  # 1 = dans le tableau, au niveau de ses éléments
+        self._in_string = False
+        self._escape = False
+        self.done = False
+
+    def _flush(self, items: List[Any]) -> None:
+        text = "".join(self._item).strip()
+        self._item = []
+        if text:
+            items.append(json.loads(text))
+
+    def feed(self, text: str) -> List[Any]:
+        items: List[Any] = []
+        for char in text:
+            if self.done:
+                break
+            if self._in_string:
+                self._item.append(char)
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if self._depth == 0:
+                if char == "[":
+                    self._depth = 1
+                continue
+            if self._depth == 1 and char in ",]":
+                self._flush(items)
+                if char == "]":
+                    self._depth = 0
+                    self.done = True
+                continue
+            self._item.append(char)
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1:
+                    self._flush(items)
+        return items
+
+    def close(self) -> None:
+        """Fin de la réponse: lève ValueError si le tableau n'a pas été terminé"""
+        if not self.done:
+            raise ValueError("Réponse JSON incomplète: tableau non terminé")
+
+
+class LLMProvider(ABC):
+    """Interface: produit la réponse JSON d'un agent pour une description de projet"""
+    name = "base"
+
+    @abstractmethod
+    async def generate_json(self, agent: str, description: str, prompt: str,
+                            features: Optional[ProjectFeatures] = None) -> Any:
+        """Réponse JSON décodée de l'agent `agent`"""
+
+    async def stream_json_items(self, agent: str, description: str, prompt: str,
+                                features: Optional[ProjectFeatures] = None) -> AsyncIterator[Any]:
+        """Éléments du tableau JSON de la réponse, au fil de l'eau (par défaut: une fois la réponse complète)"""
+        result = await self.generate_json(agent, description, prompt, features=features)
+        if not isinstance(result, list):
+            raise ValueError(f"Réponse du fournisseur invalide pour {agent}: tableau JSON attendu")
+        for item in result:
+            yield item
+
+    def stats(self) -> Dict[str, Any]:
+        return {"provider": self.name}
+
+    async def aclose(self) -> None:
+        pass
+
+
+class MockProvider(LLMProvider):
+    name = "mock"
+
+    def __init__(self, generators: Dict[str, Callable[..., Any]]):
+        # Générateurs locaux synchrones et picklables par agent (ex: "planner" -> generate_tasks_local)
+        self.generators = generators
+
+    async def generate_json(self, agent: str, description: str, prompt: str,
+                            features: Optional[ProjectFeatures] = None) -> Any:
+        return await run_cpu(self.generators[agent], description, features)
+
+
+class HTTPProvider(LLMProvider):
+    name = "http"
+
+    def __init__(self, base_url: str, model: str, api_key: Optional[str] = None, max_concurrency: int = 8,
+                 timeout: float = 30.0, connect_timeout: float = 5.0, max_retries: int = 3,
+                 retry_base: float = 0.5, retry_max: float = 8.0, http2: bool = True,
+                 limiter: Optional[RateLimiter] = None, completion_tokens: int = 2000):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.http2 = http2 and _http2_available()
+        if http2 and not self.http2:
+            logger.warning("⚠️ LLM provider: paquet `h2` absent, repli sur HTTP/1.1 keep-alive")
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._counters = {"requests": 0, "retries": 0, "errors": 0}
+        self._in_flight = 0
+        self.limiter = limiter
+        self.completion_tokens = completion_tokens
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Client partagé, créé à la première utilisation (dans la boucle d'événements courante)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits, http2=self.http2)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(self.retry_max, float(retry_after))
+            except ValueError:
+                pass
+        # Full jitter: uniforme entre 0 et le backoff exponentiel plafonné
+        return random.uniform(0, min(self.retry_max, self.retry_base * (2 ** attempt)))
+
+    def _request(self, prompt: str) -> Tuple[Dict[str, Any], Optional[Dict[str, str]]]:
+        """Corps et en-têtes d'une requête generateContent / streamGenerateContent"""
+        body = {
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": {"responseMimeType": "application/json"}
+        }
+        # Clé en en-tête et non en paramètre: elle n'apparaît pas dans les URLs journalisées (httpx, proxies)
+        headers = {"x-goog-api-key": self.api_key} if self.api_key else None
+        return body, headers
+
+    async def _before_retry(self, agent: str, attempt: int, error: Exception, retry_after: Optional[str]) -> None:
+        """Lève `error` après la dernière tentative, sinon attend le backoff"""
+        if attempt == self.max_retries:
+            self._counters["errors"] += 1
+            raise error
+        self._counters["retries"] += 1
+        delay = self._retry_delay(attempt, retry_after)
+        if self.limiter is not None and getattr(error, "response", None) is not None \
+                and error.response.status_code == 429:
+            # Quota dépassé côté fournisseur: tout le monde attend, pas seulement cet appel
+            self.limiter.pause(delay)
+        logger.warning(f"🔁 LLM provider ({agent}): {error!r}, nouvel essai dans {delay:.2f}s")
+        await asyncio.sleep(delay)
+
+    async def generate_json(self, agent: str, description: str, prompt: str,
+                            features: Optional[ProjectFeatures] = None) -> Any:
+        # `features` ne sert qu'aux générateurs locaux: le modèle reçoit le prompt
+        client = self.client
+        url = f"{self.base_url}/v1beta/models/{self.model}:generateContent"
+        body, headers = self._request(prompt)
+        estimated = estimate_tokens(prompt, self.completion_tokens)
+
+        for attempt in range(self.max_retries + 1):
+            # Chaque tentative consomme du quota: on attend le limiteur avant de prendre une connexion
+            if self.limiter is not None:
+                await self.limiter.acquire(estimated)
+            self._counters["requests"] += 1
+            retry_after = None
+            try:
+                async with self._semaphore:
+                    self._in_flight += 1
+                    try:
+                        response = await client.post(url, json=body, headers=headers)
+                    finally:
+                        self._in_flight -= 1
+                if response.status_code not in RETRYABLE_STATUS:
+                    response.raise_for_status()
+                    payload = response.json()
+                    if self.limiter is not None:
+                        self.limiter.reconcile(estimated, payload.get("usageMetadata", {}).get("totalTokenCount", 0))
+                    return self._parse(payload)
+                retry_after = response.headers.get("retry-after")
+                error: Exception = httpx.HTTPStatusError(
+                    f"HTTP {response.status_code}", request=response.request, response=response
+                )
+            except (httpx.TransportError, httpx.TimeoutException) as e:
+                error = e
+            await self._before_retry(agent, attempt, error, retry_after)
+
+    async def stream_json_items(self, agent: str, description: str, prompt: str,
+                                features: Optional[ProjectFeatures] = None) -> AsyncIterator[Any]:
+        """
+        streamGenerateContent (SSE): le tableau JSON est parsé au fil des fragments de texte et
+        chaque élément est produit dès qu'il est complet. Réessayé tant qu'aucun élément n'est parti.
+        """
+        client = self.client
+        url = f"{self.base_url}/v1beta/models/{self.model}:streamGenerateContent"
+        body, headers = self._request(prompt)
+        estimated = estimate_tokens(prompt, self.completion_tokens)
+
+        for attempt in range(self.max_retries + 1):
+            if self.limiter is not None:
+                await self.limiter.acquire(estimated)
+            self._counters["requests"] += 1
+            retry_after = None
+            error: Optional[Exception] = None
+            emitted = 0
+            used_tokens = 0
+            parser = JSONArrayStream()
+            try:
+                async with self._semaphore:
+                    self._in_flight += 1
+                    try:
+                        async with client.stream("POST", url, params={"alt": "sse"}, json=body,
+                                                 headers=headers) as response:
+                            if response.status_code in RETRYABLE_STATUS:
+                                retry_after = response.headers.get("retry-after")
+                                error = httpx.HTTPStatusError(
+                                    f"HTTP {response.status_code}", request=response.request, response=response
+                                )
+                            else:
+                                response.raise_for_status()
+                                async for line in response.aiter_lines():
+                                    if not line.startswith("data:"):
+                                        continue
+                                    chunk = json.loads(line[5:])
+                                    used_tokens = chunk.get("usageMetadata", {}).get("totalTokenCount", used_tokens)
+                                    for item in parser.feed(self._chunk_text(chunk)):
+                                        emitted += 1
+                                        yield item
+                    finally:
+                        self._in_flight -= 1
+            except (httpx.TransportError, httpx.TimeoutException) as e:
+                if emitted:
+                    # Des éléments sont déjà partis chez l'appelant: on ne peut pas rejouer la requête
+                    self._counters["errors"] += 1
+                    raise
+                error = e
+            if error is None:
+                parser.close()
+                if self.limiter is not None:
+                    self.limiter.reconcile(estimated, used_tokens)
+                return
+            await self._before_retry(agent, attempt, error, retry_after)
+
+    @staticmethod
+    def _chunk_text(chunk: Dict[str, Any]) -> str:
+        """Fragment de texte d'un événement streamGenerateContent (vide pour le dernier, usage seul)"""
+        candidates = chunk.get("candidates") or [{}]
+        parts = candidates[0].get("content", {}).get("parts", [])
+        return "".join(part.get("text", "") for part in parts)
+
+    @staticmethod
+    def _parse(payload: Dict[str, Any]) -> Any:
+        """Extrait le JSON du premier candidat de la réponse generateContent"""
+        text = payload["candidates"][0]["content"]["parts"][0]["text"]
+        return json.loads(text)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._counters)
+        stats.update({
+            "provider": self.name,
+            "model": self.model,
+            "http2": self.http2,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight
+        })
+        return stats
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def build_provider(generators: Dict[str, Callable[..., Any]]) -> LLMProvider:
+    """Fournisseur choisi par LLM_PROVIDER ("mock" ou "http")"""
+    if settings.LLM_PROVIDER == "http":
+        return HTTPProvider(
+            base_url=settings.LLM_BASE_URL,
+            model=settings.LLM_MODEL,
+            api_key=settings.GEMINI_API_KEY,
+            max_concurrency=settings.LLM_MAX_CONCURRENCY,
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+            max_retries=settings.LLM_MAX_RETRIES,
+            retry_base=settings.LLM_RETRY_BASE_SECONDS,
+            http2=settings.LLM_HTTP2,
+            limiter=rate_limiter,
+            completion_tokens=settings.LLM_COMPLETION_TOKENS_ESTIMATE,
+        )
+    return MockProvider(generators)
@@ -0,0 +1,76 @@
+# backend/app/services/pagination.py
+"""
+Pagination par clé (keyset): la page suivante reprend après la dernière clé de tri vue,
+via un index composite, au lieu de sauter `offset` lignes. Coût constant quelle que soit
+la profondeur de la page. Le curseur est opaque pour le client (JSON en base64 url-safe).
+"""
+import base64
+import binascii
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import Select, and_, or_, select
+from sqlalchemy.orm import Session
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Valeurs de la clé de tri encodées dans le curseur (ValueError si invalide)"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Curseur invalide")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Curseur invalide")
+    return values
+
+
+def parse_fields(fields: Optional[str], model) -> List[str]:
+    """Colonnes demandées (`fields=id,title,...`), toutes par défaut; `id` est toujours inclus"""
+    columns = [column.key for column in model.__table__.columns]
+    if not fields:
+        return columns
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in columns]
+    if unknown:
+        raise ValueError(f"Champs inconnus: {', '.join(unknown)} (disponibles: {', '.join(columns)})")
+    return ["id"] + [name for name in dict.fromkeys(requested) if name != "id"]
+
+
+def _after(columns: Sequence[Any], values: Sequence[Any]):
+    """
+    (c1, c2, ...) > (v1, v2, ...) sous une forme utilisable par l'index:
+    c1 >= v1 AND (c1 > v1 OR (c2, ...) > (v2, ...))
+    """
+    if len(columns) == 1:
+        return columns[0] > values[0]
+    return and_(columns[0] >= values[0], or_(columns[0] > values[0], _after(columns[1:], values[1:])))
+
+
+def keyset_query(model, fields: Sequence[str], order_by: Sequence[Any], filters: Sequence[Any],
+                 after: Optional[Sequence[Any]], limit: int) -> Select:
+    """SELECT d'une page: lignes qui suivent la clé `after` (None: première page)"""
+    keys = [column.key for column in order_by]
+    selected = list(dict.fromkeys([*fields, *keys]))
+    query = select(*(model.__table__.c[name] for name in selected)).where(*filters)
+    if after is not None:
+        query = query.where(_after(order_by, after))
+    return query.order_by(*order_by).limit(limit)
+
+
+def keyset_page(db: Session, model, fields: Sequence[str], order_by: Sequence[Any], filters: Sequence[Any],
+                cursor: Optional[str], limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Une page de `model` triée par `order_by` (clé unique, se terminant par l'id).
+    Retourne les lignes (colonnes `fields` uniquement) et le curseur de la page suivante.
+    """
+    keys = [column.key for column in order_by]
+    after = decode_cursor(cursor, len(order_by)) if cursor else None
+    # Une ligne de plus que demandé: indique s'il existe une page suivante
+    rows = db.execute(keyset_query(model, fields, order_by, filters, after, limit + 1)).mappings().all()
+
+    next_cursor = encode_cursor([rows[limit - 1][key] for key in keys]) if len(rows) > limit else None
+    return [{name: row[name] for name in fields} for row in rows[:limit]], next_cursor
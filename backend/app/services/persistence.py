@@ -0,0 +1,164 @@
+# backend/app/services/persistence.py
+"""
+Persistance en masse des tâches et user stories générées par les agents
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.project import Project
+from app.models.task import Task
+from app.models.task_dependency import TaskDependency
+from app.models.user_story import UserStory
+from app.services.dependencies import insert_task_dependencies, resolve_edges
+
+
+def _to_date(value):
+    return datetime.fromisoformat(value).date() if value else None
+
+
+def _in_insert_order(rows):
+    # L'ordre de RETURNING n'est pas garanti par SQLite, mais les clés primaires
+    # auto-incrémentées suivent l'ordre des VALUES: trier par id suffit.
+    # (sort_by_parameter_order=True fait retomber SQLite sur un INSERT par ligne)
+    return sorted(rows, key=lambda row: row.id)
+
+
+def _local_task_ids(tasks_data: List[Dict[str, Any]]):
+    # Identifiants produits par le Planner (`order + 1` par défaut)
+    return (task_data.get("id", task_data.get("order", i) + 1) for i, task_data in enumerate(tasks_data))
+
+
+def task_values(project_id: int, task_data: Dict[str, Any], status: Optional[str] = None) -> Dict[str, Any]:
+    """Convertit une tâche générée en valeurs de colonnes"""
+    return {
+        "project_id": project_id,
+        "title": task_data.get("title", ""),
+        "description": task_data.get("description", ""),
+        "duration_days": task_data.get("duration_days", 1),
+        "start_date": _to_date(task_data.get("start_date")),
+        "end_date": _to_date(task_data.get("end_date")),
+        "priority": task_data.get("priority", "medium"),
+        "status": status or task_data.get("status", "todo"),
+        "dependencies": task_data.get("dependencies", ""),
+        "order": task_data.get("order") or 0,  # clé de tri des listes: jamais NULL
+    }
+
+
+def story_values(project_id: int, story_data: Dict[str, Any], status: Optional[str] = None) -> Dict[str, Any]:
+    """Convertit une user story générée en valeurs de colonnes"""
+    return {
+        "project_id": project_id,
+        "title": story_data.get("title", ""),
+        "description": story_data.get("description", ""),
+        "points": story_data.get("points", 0),
+        "priority": story_data.get("priority", "Should Have"),
+        "status": status or story_data.get("status", "todo"),
+        "sprint": story_data.get("sprint") or 0,
+        "acceptance_criteria": story_data.get("acceptance_criteria", ""),
+    }
+
+
+async def bulk_insert_tasks(db: AsyncSession, project_id: int, tasks_data: List[Dict[str, Any]],
+                            status: Optional[str] = None) -> List[Task]:
+    """
+    Insère toutes les tâches via INSERT ... RETURNING multi-lignes, dans l'ordre de `tasks_data`,
+    ainsi que leurs arêtes dans task_dependencies
+    """
+    if not tasks_data:
+        return []
+    rows = [task_values(project_id, task_data, status) for task_data in tasks_data]
+    result = await db.scalars(insert(Task).returning(Task), rows)
+    tasks = _in_insert_order(result.all())
+    
+    # Arêtes du graphe: les dépendances référencent les identifiants locaux du Planner
+    edges = resolve_edges(
+        _local_task_ids(tasks_data),
+        (task_data.get("dependencies") for task_data in tasks_data),
+        (task.id for task in tasks),
+    )
+    await insert_task_dependencies(db, project_id, edges)
+    return tasks
+
+
+async def bulk_insert_user_stories(db: AsyncSession, project_id: int, stories_data: List[Dict[str, Any]],
+                                   status: Optional[str] = None) -> List[UserStory]:
+    """
+    Insère toutes les user stories via INSERT ... RETURNING multi-lignes, dans l'ordre de `stories_data`
+    """
+    if not stories_data:
+        return []
+    rows = [story_values(project_id, story_data, status) for story_data in stories_data]
+    result = await db.scalars(insert(UserStory).returning(UserStory), rows)
+    return _in_insert_order(result.all())
+
+
+async def bulk_insert_generated_projects(db: AsyncSession, results: List[Dict[str, Any]]
+                                         ) -> List[Tuple[Project, List[Task], List[UserStory]]]:
+    """
+    Persiste plusieurs projets générés avec un INSERT ... RETURNING par table pour tout le lot
+    (projets, tâches, arêtes, user stories), sans commit: l'appelant contrôle la transaction
+    """
+    if not results:
+        return []
+    projects = _in_insert_order((await db.scalars(insert(Project).returning(Project), [
+        {
+            "name": result["name"],
+            "description": result["description"],
+            "start_date": _to_date(result["start_date"]),
+            "status": "active"
+        }
+        for result in results
+    ])).all())
+
+    task_rows = [task_values(project.id, task_data)
+                 for project, result in zip(projects, results) for task_data in result.get("tasks", [])]
+    story_rows = [story_values(project.id, story_data)
+                  for project, result in zip(projects, results) for story_data in result.get("user_stories", [])]
+    tasks = _in_insert_order((await db.scalars(insert(Task).returning(Task), task_rows)).all()) if task_rows else []
+    stories = _in_insert_order((await db.scalars(insert(UserStory).returning(UserStory), story_rows)).all()) if story_rows else []
+
+    # Redécoupage par projet, dans l'ordre d'insertion
+    persisted = []
+    edges = []
+    task_offset = story_offset = 0
+    for project, result in zip(projects, results):
+        tasks_data = result.get("tasks", [])
+        project_tasks = tasks[task_offset:task_offset + len(tasks_data)]
+        project_stories = stories[story_offset:story_offset + len(result.get("user_stories", []))]
+        task_offset += len(project_tasks)
+        story_offset += len(project_stories)
+        edges.extend(
+            {"task_id": task_id, "depends_on_id": depends_on_id, "project_id": project.id}
+            for task_id, depends_on_id in resolve_edges(
+                _local_task_ids(tasks_data),
+                (task_data.get("dependencies") for task_data in tasks_data),
+                (task.id for task in project_tasks),
+            )
+        )
+        persisted.append((project, project_tasks, project_stories))
+
+    if edges:
+        await db.execute(insert(TaskDependency), edges)
+    return persisted
+
+
+async def bulk_update_task_dates(db: AsyncSession, loaded_tasks: List[Task],
+                                 scheduled_tasks: List[Dict[str, Any]]) -> int:
+    """
+    Reporte les dates planifiées sur des tâches déjà chargées en un seul UPDATE executemany.
+    Seules les tâches dont les dates changent sont écrites; retourne leur nombre.
+    """
+    tasks_by_id = {task.id: task for task in loaded_tasks}
+    updates = []
+    for scheduled in scheduled_tasks:
+        task = tasks_by_id.get(scheduled["id"])
+        if task is None:
+            continue
+        start_date = _to_date(scheduled.get("start_date"))
+        end_date = _to_date(scheduled.get("end_date"))
+        if task.start_date != start_date or task.end_date != end_date:
+            updates.append({"id": task.id, "start_date": start_date, "end_date": end_date})
+    if updates:
+        await db.execute(update(Task), updates)
+    return len(updates)
@@ -0,0 +1,80 @@
+# backend/app/services/project_classifier.py
+"""
+Classification d'une description de projet en indicateurs (web, mobile, e-commerce...) partagés
+par les agents. La table de mots-clés est dédupliquée une fois à l'import; chaque description
+est classée une seule fois par requête et le résultat est passé à tous les agents.
+"""
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Optional, Tuple
+
+# Mots-clés par consommateur et par indicateur (recherche de sous-chaîne, texte en minuscules)
+FEATURE_KEYWORDS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "planner": {
+        "web": ("site", "web", "application", "frontend", "backend", "api"),
+        "ecommerce": ("e-commerce", "ecommerce", "boutique", "panier", "paiement", "stripe", "paypal"),
+        "mobile": ("mobile", "ios", "android", "app mobile"),
+        "data": ("data", "donnée", "analyse", "dashboard", "visualisation"),
+        "auth": ("authentification", "login", "utilisateur", "compte"),
+        "admin": ("admin", "administration", "gestion"),
+    },
+    "backlog": {
+        "ecommerce": ("e-commerce", "ecommerce", "boutique", "panier", "paiement"),
+        "users": ("utilisateur", "user", "compte", "profil", "login"),
+        "admin": ("admin", "administration", "gestion"),
+        "dashboard": ("dashboard", "tableau de bord", "visualisation", "graphique"),
+    },
+    "tech_advisor": {
+        "web": ("site", "web", "application web"),
+        "mobile": ("mobile", "ios", "android", "app mobile"),
+        "api": ("api", "backend", "serveur"),
+        "ecommerce": ("e-commerce", "ecommerce", "boutique", "shop"),
+        "dashboard": ("dashboard", "tableau de bord", "analytics"),
+        "realtime": ("temps réel", "realtime", "chat", "notification"),
+    },
+}
+
+# Type de projet: premier indicateur présent dans cet ordre
+PROJECT_TYPES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("E-commerce", ("e-commerce", "ecommerce")),
+    ("Application Mobile", ("mobile",)),
+    ("Dashboard / Analytics", ("dashboard", "tableau de bord")),
+    ("Backend API", ("api",)),
+    ("Application Web", ("site", "web")),
+)
+DEFAULT_PROJECT_TYPE = "Projet Logiciel"
+
+
+# Chaque mot-clé n'est cherché qu'une fois, même s'il sert à plusieurs indicateurs
+_ALL_KEYWORDS = tuple(sorted(
+    {keyword for flags in FEATURE_KEYWORDS.values() for words in flags.values() for keyword in words}
+    | {keyword for _, words in PROJECT_TYPES for keyword in words}
+))
+_FLAG_KEYWORDS = {
+    (consumer, flag): frozenset(words)
+    for consumer, flags in FEATURE_KEYWORDS.items()
+    for flag, words in flags.items()
+}
+
+
+@dataclass(frozen=True)
+class ProjectFeatures:
+    """Résultat immuable de la classification, calculé une fois par requête"""
+    keywords: FrozenSet[str]
+    flags: FrozenSet[Tuple[str, str]]
+    project_type: str
+
+    def has(self, consumer: str, flag: str) -> bool:
+        return (consumer, flag) in self.flags
+
+
+def classify_project(description: Optional[str]) -> ProjectFeatures:
+    """Extrait tous les indicateurs de la description (recherche de sous-chaîne, sans casse)"""
+    text = (description or "").lower()
+    found = frozenset(keyword for keyword in _ALL_KEYWORDS if keyword in text)
+
+    flags = frozenset(key for key, words in _FLAG_KEYWORDS.items() if not words.isdisjoint(found))
+    project_type = next(
+        (name for name, words in PROJECT_TYPES if not found.isdisjoint(words)),
+        DEFAULT_PROJECT_TYPE
+    )
+    return ProjectFeatures(found, flags, project_type)
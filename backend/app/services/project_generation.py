@@ -0,0 +1,195 @@
+# backend/app/services/project_generation.py
+"""
+Persistance et sérialisation d'un projet généré par les agents
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.agents.coordinator import AgentCoordinator
+from app.core.database import AsyncSessionLocal
+from app.core.executor import run_cpu_for
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user_story import UserStory
+from app.schemas.generation import (
+    BatchError, BatchLine, BatchProjectResult, BatchProjectSummary, GeneratedProject, GeneratedProjectResponse
+)
+from app.services.persistence import bulk_insert_generated_projects, bulk_insert_tasks, bulk_insert_user_stories
+from app.services.rate_limiter import BACKGROUND, llm_context
+from app.services.response_cache import response_cache
+from app.services.work_calendar import DEFAULT_CALENDAR
+
+logger = logging.getLogger(__name__)
+
+
+async def persist_generated_project(db: AsyncSession, result: Dict[str, Any]) -> Tuple[Project, List[Task], List[UserStory]]:
+    """
+    Crée le projet puis ses tâches et user stories (un INSERT ... RETURNING par table),
+    en une seule transaction: un échec ne laisse pas de projet vide (les jobs sont rejoués)
+    """
+    db_project = Project(
+        name=result["name"],
+        description=result["description"],
+        start_date=datetime.fromisoformat(result["start_date"]).date(),
+        status="active"
+    )
+    try:
+        db.add(db_project)
+        await db.flush()  # id du projet, sans commit
+        await db.refresh(db_project)
+
+        tasks_list = await bulk_insert_tasks(db, db_project.id, result.get("tasks", []))
+        stories_list = await bulk_insert_user_stories(db, db_project.id, result.get("user_stories", []))
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    response_cache.invalidate_project(db_project.id, listing=True)
+    return db_project, tasks_list, stories_list
+
+
+def generate_gantt_code(tasks: list, project_name: str, excludes: str = "") -> str:
+    """Génère le code Mermaid pour le diagramme de Gantt"""
+    gantt_lines = [
+        "gantt",
+        f"    title {project_name}",
+        "    dateFormat YYYY-MM-DD"
+    ]
+    if excludes:
+        # Les durées "Nd" sont alors comptées en jours ouvrés, comme le planning
+        gantt_lines.append(f"    excludes {excludes}")
+    gantt_lines.append("")
+    
+    for task in tasks:
+        status = "done" if task.get("status") == "done" else "active" if task.get("status") == "in_progress" else "crit"
+        start = task.get("start_date", "")
+        duration = task.get("duration_days", 1)
+        
+        gantt_lines.append(f"    {task.get('title', 'Task')} :{status}, {start}, {duration}d")
+    
+    return "\n".join(gantt_lines)
+
+
+async def render_gantt_code(tasks: list, project_name: str, excludes: str = "") -> str:
+    """generate_gantt_code hors de la boucle d'événements (pool de processus pour les gros projets)"""
+    return await run_cpu_for(len(tasks), generate_gantt_code, tasks, project_name, excludes)
+
+
+def _response_fields(result: Dict[str, Any], db_project: Project, tasks_list: List[Task],
+                     stories_list: List[UserStory], gantt_code: str) -> Dict[str, Any]:
+    # Lignes ORM telles quelles: pydantic-core lit leurs attributs (from_attributes)
+    return {
+        "project": db_project,
+        "tasks": tasks_list,
+        "user_stories": stories_list,
+        "gantt_code": gantt_code,
+        "tech_recommendations": result["tech_recommendations"],
+        "metrics": result.get("metrics", {}),
+        "agents_used": result.get("agents_used", [])
+    }
+
+
+async def generated_project_response(result: Dict[str, Any], db_project: Project,
+                                     tasks_list: List[Task], stories_list: List[UserStory],
+                                     index: Optional[int] = None) -> GeneratedProjectResponse:
+    """Réponse complète d'une génération, à partir des lignes insérées (ligne de lot si `index`)"""
+    # Générer le code Mermaid pour le Gantt
+    gantt_code = await render_gantt_code(result.get("tasks", []), result["name"], DEFAULT_CALENDAR.mermaid_excludes())
+    fields = _response_fields(result, db_project, tasks_list, stories_list, gantt_code)
+    if index is not None:
+        return BatchProjectResult.model_validate({"index": index, **fields}, from_attributes=True)
+    return GeneratedProjectResponse.model_validate(fields, from_attributes=True)
+
+
+async def generate_project_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Handler de la file de jobs: même traitement que /generate, hors requête HTTP"""
+    # Régénération en arrière-plan: servie après les requêtes interactives
+    with llm_context(priority=BACKGROUND):
+        result = await AgentCoordinator().create_project(payload)
+    async with AsyncSessionLocal() as db:
+        db_project, tasks_list, stories_list = await persist_generated_project(db, result)
+        response = await generated_project_response(result, db_project, tasks_list, stories_list)
+        # Résultat du job stocké en JSON
+        return response.model_dump(mode="json")
+
+
+async def batch_result(index: int, result: Dict[str, Any], project: Project, tasks_list: List[Task],
+                 stories_list: List[UserStory], full: bool = False) -> BatchLine:
+    """Ligne de résultat d'un projet du lot: résumé, ou réponse complète si `full`"""
+    if full:
+        return await generated_project_response(result, project, tasks_list, stories_list, index=index)
+    return BatchProjectSummary(
+        index=index,
+        project=GeneratedProject.model_validate(project),
+        tasks_count=len(tasks_list),
+        user_stories_count=len(stories_list),
+        project_type=result["tech_recommendations"].get("project_type"),
+        metrics=result.get("metrics", {}),
+        agents_used=result.get("agents_used", [])
+    )
+
+
+async def generate_batch(projects: List[Tuple[int, Dict[str, Any]]], concurrency: int, chunk_size: int,
+                         flush_seconds: float, full: bool = False) -> AsyncIterator[BatchLine]:
+    """
+    Génère un lot de projets avec au plus `concurrency` générations simultanées et persiste
+    les résultats par paquets de `chunk_size` projets (une transaction par paquet).
+    Produit un résultat par projet, dans l'ordre de fin de persistance.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    done: asyncio.Queue = asyncio.Queue()
+
+    async def generate(index: int, project_data: Dict[str, Any]) -> None:
+        async with semaphore:
+            try:
+                # Import de portefeuille: servi après les requêtes interactives, équitable entre projets
+                with llm_context(project=f"batch-{index}", priority=BACKGROUND):
+                    result = await AgentCoordinator().create_project(project_data)
+            except Exception as e:
+                await done.put((index, None, str(e)))
+                return
+        await done.put((index, result, None))
+
+    async def flush(chunk: List[Tuple[int, Dict[str, Any]]]) -> List[BatchLine]:
+        try:
+            async with AsyncSessionLocal() as db:
+                persisted = await bulk_insert_generated_projects(db, [result for _, result in chunk])
+                await db.commit()
+            for db_project, _, _ in persisted:
+                response_cache.invalidate_project(db_project.id, listing=True)
+        except Exception as e:
+            logger.error(f"❌ Lot: échec de persistance de {len(chunk)} projets: {e}")
+            return [BatchError(index=index, error=f"Persistance: {e}") for index, _ in chunk]
+        return [
+            await batch_result(index, result, *rows, full=full)
+            for (index, result), rows in zip(chunk, persisted)
+        ]
+
+    workers = [asyncio.ensure_future(generate(index, data)) for index, data in projects]
+    try:
+        chunk: List[Tuple[int, Dict[str, Any]]] = []
+        for remaining in range(len(projects), 0, -1):
+            try:
+                # Sans nouveau résultat pendant `flush_seconds`, on persiste le paquet en cours
+                item = await asyncio.wait_for(done.get(), timeout=flush_seconds) if chunk else await done.get()
+            except asyncio.TimeoutError:
+                for line in await flush(chunk):
+                    yield line
+                chunk = []
+                item = await done.get()
+
+            index, result, error = item
+            if error is not None:
+                yield BatchError(index=index, error=error)
+            else:
+                chunk.append((index, result))
+            if chunk and (len(chunk) >= chunk_size or remaining == 1):
+                for line in await flush(chunk):
+                    yield line
+                chunk = []
+    finally:
+        # Client déconnecté: on abandonne les générations restantes
+        for worker in workers:
+            worker.cancel()
@@ -0,0 +1,215 @@
+# backend/app/services/rate_limiter.py
+"""
+Limiteur de débit des appels LLM: deux token buckets (requêtes/min et tokens/min).
+Les appels en attente sont servis par priorité (interactif avant arrière-plan), puis
+en round-robin entre projets pour qu'un gros projet n'affame pas les autres.
+Le projet et la priorité de l'appel courant sont portés par des ContextVar (voir llm_context).
+"""
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Optional
+from app.core.config import settings
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+PRIORITIES = (INTERACTIVE, BACKGROUND)
+
+llm_priority: ContextVar[str] = ContextVar("llm_priority", default=INTERACTIVE)
+llm_project: ContextVar[str] = ContextVar("llm_project", default="default")
+
+
+@contextmanager
+def llm_context(project: Optional[Any] = None, priority: Optional[str] = None):
+    """Associe les appels LLM du bloc à un projet et une priorité"""
+    tokens = []
+    if project is not None:
+        tokens.append((llm_project, llm_project.set(str(project))))
+    if priority is not None:
+        tokens.append((llm_priority, llm_priority.set(priority)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+def estimate_tokens(prompt: str, completion_tokens: int) -> int:
+    """Estimation grossière: ~4 caractères par token de prompt + complétion attendue"""
+    return len(prompt) // 4 + completion_tokens
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float, burst: Optional[float] = None):
+        # Rafale par défaut: une minute de quota
+        self.capacity = burst or per_minute
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until(self, amount: float, now: float) -> float:
+        """Secondes avant que `amount` soit disponible (plafonné à la capacité)"""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return missing / self.rate if missing > 0 else 0.0
+
+    def consume(self, amount: float) -> None:
+        # Le niveau peut devenir négatif (dette) si l'appel dépasse la capacité
+        self.level -= amount
+
+    def refund(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+
+class _Waiter:
+    __slots__ = ("future", "tokens")
+
+    def __init__(self, future: asyncio.Future, tokens: int):
+        self.future = future
+        self.tokens = tokens
+
+
+class RateLimiter:
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, burst_seconds: Optional[float] = None):
+        # `burst_seconds`: rafale autorisée en secondes de quota (par défaut une minute entière)
+        self.enabled = requests_per_minute > 0 or tokens_per_minute > 0
+        self.requests = self._bucket(requests_per_minute, burst_seconds)
+        self.tokens = self._bucket(tokens_per_minute, burst_seconds)
+        self._queues: Dict[str, "OrderedDict[str, Deque[_Waiter]]"] = {p: OrderedDict() for p in PRIORITIES}
+        self._paused_until = 0.0
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._history: Deque = deque()  # (instant, tokens) des appels accordés sur la dernière minute
+        self._counters = {"granted": 0, "waited": 0, "wait_seconds": 0.0, "pauses": 0}
+
+    @staticmethod
+    def _bucket(per_minute: int, burst_seconds: Optional[float]) -> Optional[TokenBucket]:
+        if per_minute <= 0:
+            return None
+        return TokenBucket(per_minute, per_minute * burst_seconds / 60 if burst_seconds else None)
+
+    async def acquire(self, tokens: int) -> None:
+        """Attend que le budget permette un appel de `tokens` tokens estimés, puis le consomme"""
+        if not self.enabled:
+            return
+        priority = llm_priority.get()
+        project = llm_project.get()
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(loop.create_future(), tokens)
+        self._queues.get(priority, self._queues[BACKGROUND]).setdefault(project, deque()).append(waiter)
+
+        # Relance du dispatcher: un nouvel arrivant plus prioritaire est pris en compte sans attendre
+        # la fin du sommeil en cours (le dispatcher n'est interruptible que pendant ce sommeil)
+        if self._dispatcher is not None and not self._dispatcher.done() and self._dispatcher.get_loop() is loop:
+            self._dispatcher.cancel()
+        self._dispatcher = loop.create_task(self._dispatch())
+
+        started = time.monotonic()
+        await waiter.future
+        waited = time.monotonic() - started
+        if waited > 0.001:
+            self._counters["waited"] += 1
+            self._counters["wait_seconds"] += waited
+
+    def reconcile(self, estimated: int, actual: int) -> None:
+        """Corrige le bucket de tokens avec l'usage réel rapporté par le fournisseur"""
+        if self.tokens is not None and actual:
+            if actual < estimated:
+                self.tokens.refund(estimated - actual)
+            else:
+                self.tokens.consume(actual - estimated)
+
+    def pause(self, seconds: float) -> None:
+        """Suspend les attributions (ex: 429 reçu) pour éviter une rafale de retries"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._counters["pauses"] += 1
+
+    def _head(self):
+        for priority in PRIORITIES:
+            queue = self._queues[priority]
+            while queue:
+                project, waiters = next(iter(queue.items()))
+                while waiters and waiters[0].future.done():
+                    waiters.popleft()  # Appelant annulé
+                if waiters:
+                    return queue, project, waiters
+                del queue[project]
+        return None
+
+    async def _dispatch(self) -> None:
+        while True:
+            head = self._head()
+            if head is None:
+                return
+            queue, project, waiters = head
+            waiter = waiters[0]
+
+            now = time.monotonic()
+            wait = self._paused_until - now
+            if self.requests is not None:
+                wait = max(wait, self.requests.time_until(1, now))
+            if self.tokens is not None:
+                wait = max(wait, self.tokens.time_until(waiter.tokens, now))
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+
+            if self.requests is not None:
+                self.requests.consume(1)
+            if self.tokens is not None:
+                self.tokens.consume(waiter.tokens)
+            waiters.popleft()
+            # Round-robin: le projet servi passe en fin de file
+            if waiters:
+                queue.move_to_end(project)
+            else:
+                del queue[project]
+            self._trim_history(now)
+            self._history.append((now, waiter.tokens))
+            self._counters["granted"] += 1
+            waiter.future.set_result(None)
+
+    def _trim_history(self, now: float) -> None:
+        while self._history and self._history[0][0] < now - 60:
+            self._history.popleft()
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        self._trim_history(now)
+        stats: Dict[str, Any] = dict(self._counters)
+        stats["wait_seconds"] = round(stats["wait_seconds"], 3)
+        stats.update({
+            "enabled": self.enabled,
+            "paused_for_seconds": round(max(0.0, self._paused_until - now), 3),
+            "queued": {
+                priority: sum(len(waiters) for waiters in queue.values())
+                for priority, queue in self._queues.items()
+            },
+            "queued_projects": len(set().union(*(queue.keys() for queue in self._queues.values()))),
+        })
+        for name, bucket, used in (
+            ("requests", self.requests, len(self._history)),
+            ("tokens", self.tokens, sum(tokens for _, tokens in self._history)),
+        ):
+            if bucket is not None:
+                bucket._refill(now)
+                stats[name] = {
+                    "per_minute": bucket.rate * 60,
+                    "available": round(bucket.level, 1),
+                    "used_last_minute": used,
+                    "utilization": round(used / (bucket.rate * 60), 4)
+                }
+        return stats
+
+
+# Instance globale, partagée par tous les appels au fournisseur LLM
+rate_limiter = RateLimiter(
+    settings.LLM_REQUESTS_PER_MINUTE,
+    settings.LLM_TOKENS_PER_MINUTE,
+    burst_seconds=settings.LLM_RATE_BURST_SECONDS,
+)
@@ -0,0 +1,146 @@
+# backend/app/services/response_cache.py
+"""
+Cache des réponses des routes de lecture, avec ETag et GET conditionnel.
+Chaque réponse dépend d'une portée ("projects" pour la liste, ("project", id) pour un projet
+et ses tâches/stories/calendrier) dont le compteur de version est incrémenté après chaque
+écriture. Une entrée n'est servie que si sa version est la version courante: un projet
+modifié ne fait perdre le cache que de ses propres réponses.
+Les versions viennent d'un compteur global et seules les `max_entries` dernières portées écrites
+sont suivies: une portée oubliée vaut le compteur au moment du dernier oubli (`_floor`), ce qui
+périme ses anciennes entrées sans jamais réutiliser une version déjà servie.
+L'ETag (fort) est le hash du corps: valide entre redémarrages et entre processus.
+Hypothèse: les écritures passent par ce processus (le TTL borne l'écart sinon, ex: réplica).
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.core.config import settings
+
+PROJECTS_SCOPE = "projects"
+
+
+def project_scope(project_id: int) -> Tuple[str, int]:
+    return ("project", int(project_id))
+
+
+class _Entry:
+    __slots__ = ("version", "created", "etag", "body", "headers")
+
+    def __init__(self, version: int, etag: str, body: bytes, headers: Dict[str, str]):
+        self.version = version
+        self.created = time.monotonic()
+        self.etag = etag
+        self.body = body
+        self.headers = headers
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._versions: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._clock = 0
+        self._floor = 0
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "not_modified": 0, "invalidations": 0}
+
+    def version(self, scope: Hashable) -> int:
+        with self._lock:
+            return self._versions.get(scope, self._floor)
+
+    def bump(self, *scopes: Hashable) -> None:
+        """À appeler après le commit d'une écriture: les réponses de ces portées sont périmées"""
+        with self._lock:
+            for scope in scopes:
+                self._clock += 1
+                self._versions[scope] = self._clock
+                self._versions.move_to_end(scope)
+            while len(self._versions) > self.max_entries:
+                self._versions.popitem(last=False)
+                self._floor = self._clock
+            self._counters["invalidations"] += len(scopes)
+
+    def invalidate_project(self, project_id: int, listing: bool = False) -> None:
+        """Écriture sur un projet; `listing`: ses colonnes ont changé (création, mise à jour, suppression)"""
+        scopes = [project_scope(project_id)]
+        if listing:
+            scopes.append(PROJECTS_SCOPE)
+        self.bump(*scopes)
+
+    def _lookup(self, key: str, version: int) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version or time.monotonic() - entry.created > self.ttl_seconds:
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return entry
+
+    def _store(self, key: str, entry: _Entry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def respond(self, request: Request, scope: Hashable,
+                render: Callable[[], Tuple[Any, Dict[str, str]]]) -> Response:
+        """
+        Réponse JSON de `render()` (contenu, en-têtes), servie depuis le cache si la portée n'a pas
+        changé; 304 si l'ETag correspond à If-None-Match
+        """
+        key = str(request.url)
+        # Version lue avant la requête en base: une écriture concurrente rend l'entrée périmée
+        version = self.version(scope)
+        entry = self._lookup(key, version)
+        if entry is None:
+            content, headers = render()
+            body = JSONResponse(jsonable_encoder(content)).body
+            entry = _Entry(version, f'"{hashlib.sha256(body).hexdigest()[:32]}"', body, headers)
+            self._store(key, entry)
+
+        headers = {**entry.headers, "ETag": entry.etag, "Cache-Control": "no-cache"}
+        tags = _etags(request.headers.get("if-none-match"))
+        if "*" in tags or entry.etag in tags:
+            with self._lock:
+                self._counters["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+        return Response(entry.body, media_type="application/json", headers=headers)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            stats: Dict[str, Any] = dict(self._counters)
+            stats.update({
+                "hit_ratio": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "capacity": self.max_entries,
+                "scopes": len(self._versions),
+            })
+            return stats
+
+
+def _etags(header: Optional[str]) -> set:
+    """ETags d'un en-tête If-None-Match (comparaison faible: préfixe W/ ignoré)"""
+    if not header:
+        return set()
+    tags = {tag.strip() for tag in header.split(",")}
+    return tags | {tag[2:] for tag in tags if tag.startswith("W/")}
+
+
+# Instance globale
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_SIZE,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
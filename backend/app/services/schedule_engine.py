@@ -0,0 +1,271 @@
+# backend/app/services/schedule_engine.py
+"""
+Moteur de planification: graphe de dépendances, tri topologique et chemin critique (CPM)
+"""
+import heapq
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List
+
+
+class ScheduleCycleError(ValueError):
+    """Levée quand les dépendances des tâches forment un cycle"""
+
+    def __init__(self, cycle: List[str]):
+        self.cycle = cycle
+        super().__init__(f"Cycle de dépendances détecté: {' -> '.join(cycle + cycle[:1])}")
+
+
+def parse_dependencies(value: Any) -> List[str]:
+    """Normalise les dépendances ("1, 2", [1, 2], None) en liste d'identifiants texte"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        items: Iterable[Any] = value.split(",")
+    elif isinstance(value, (list, tuple, set)):
+        items = value
+    else:
+        items = [value]
+    return [token for token in (str(item).strip() for item in items) if token]
+
+
+@dataclass
+class DependencyGraph:
+    """Graphe de tâches indexé par position (0..n-1), construit une seule fois"""
+    ids: List[Any]
+    durations: List[int]
+    predecessors: List[List[int]]
+    successors: List[List[int]]
+    unknown_dependencies: int = 0
+
+    @classmethod
+    def from_tasks(cls, tasks: List[Dict[str, Any]]) -> "DependencyGraph":
+        ids = [task["id"] for task in tasks]
+        index = {str(task_id): i for i, task_id in enumerate(ids)}
+        durations = [max(0, int(task.get("duration_days", 1) or 0)) for task in tasks]
+        predecessors: List[List[int]] = [[] for _ in tasks]
+        successors: List[List[int]] = [[] for _ in tasks]
+        unknown = 0
+
+        for i, task in enumerate(tasks):
+            value = task.get("dependencies")
+            if not value:
+                continue
+            preds = predecessors[i]
+            seen = set()  # Doublons en O(1); la liste garde l'ordre des dépendances
+            for dep_id in (value.split(",") if isinstance(value, str) else parse_dependencies(value)):
+                j = index.get(dep_id.strip())
+                if j is None:
+                    if dep_id.strip():
+                        unknown += 1
+                    continue
+                if j in seen:
+                    continue
+                seen.add(j)
+                preds.append(j)
+                successors[j].append(i)
+
+        return cls(ids, durations, predecessors, successors, unknown)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def topological_order(self) -> List[int]:
+        """Tri topologique de Kahn en O(V+E); lève ScheduleCycleError si un cycle existe"""
+        indegree = [len(preds) for preds in self.predecessors]
+        order = [i for i, degree in enumerate(indegree) if degree == 0]
+        successors = self.successors
+
+        # `order` sert aussi de file: on l'étend pendant le parcours
+        for node in order:
+            for succ in successors[node]:
+                indegree[succ] -= 1
+                if indegree[succ] == 0:
+                    order.append(succ)
+
+        if len(order) != len(self.ids):
+            raise ScheduleCycleError(self._find_cycle(indegree))
+        return order
+
+    def _find_cycle(self, indegree: List[int]) -> List[str]:
+        # Chaque nœud restant a au moins un prédécesseur restant: on remonte jusqu'à boucler
+        node = next(i for i, degree in enumerate(indegree) if degree > 0)
+        path: Dict[int, int] = {}
+        while node not in path:
+            path[node] = len(path)
+            node = next(p for p in self.predecessors[node] if indegree[p] > 0)
+        cycle = list(path)[path[node]:]
+        cycle.reverse()
+        return [str(self.ids[i]) for i in cycle]
+
+
+@dataclass
+class ScheduleResult:
+    """Résultat CPM en jours relatifs au début du projet, indexé comme le graphe"""
+    order: List[int]
+    earliest_start: List[int]
+    earliest_finish: List[int]
+    latest_start: List[int]
+    latest_finish: List[int]
+    slack: List[int]
+    project_length: int
+
+    def critical_indices(self) -> List[int]:
+        """Tâches sans marge, dans l'ordre topologique"""
+        slack = self.slack
+        return [i for i in self.order if slack[i] == 0]
+
+
+def compute_schedule(graph: DependencyGraph) -> ScheduleResult:
+    """
+    Passe avant (dates au plus tôt) puis passe arrière (dates au plus tard) en O(V+E)
+    """
+    n = len(graph)
+    order = graph.topological_order()
+    durations = graph.durations
+    predecessors = graph.predecessors
+    successors = graph.successors
+
+    earliest_start = [0] * n
+    earliest_finish = [0] * n
+    for node in order:
+        start = 0
+        for pred in predecessors[node]:
+            if earliest_finish[pred] > start:
+                start = earliest_finish[pred]
+        earliest_start[node] = start
+        earliest_finish[node] = start + durations[node]
+
+    project_length = max(earliest_finish, default=0)
+
+    latest_start = [0] * n
+    latest_finish = [0] * n
+    for node in reversed(order):
+        finish = project_length
+        for succ in successors[node]:
+            if latest_start[succ] < finish:
+                finish = latest_start[succ]
+        latest_finish[node] = finish
+        latest_start[node] = finish - durations[node]
+
+    slack = [latest_start[i] - earliest_start[i] for i in range(n)]
+    return ScheduleResult(order, earliest_start, earliest_finish, latest_start, latest_finish, slack, project_length)
+
+
+# Ordre de priorité des tâches pour l'ordonnancement sous contrainte de ressources
+PRIORITY_RANKS = {"high": 0, "medium": 1, "low": 2}
+DEFAULT_ROLE = "default"
+
+
+@dataclass
+class ResourceScheduleResult:
+    """
+    Planning sous contrainte de ressources, indexé comme le graphe.
+    `latest_start`/`slack` tiennent compte des ressources: retarder une tâche de sa marge ne
+    décale ni ses successeurs, ni la tâche suivante de la même ressource, ni la fin du projet.
+    """
+    start: List[int]
+    finish: List[int]
+    assigned_to: List[str]
+    project_length: int
+    latest_start: List[int]
+    slack: List[int]
+
+
+def _constrained_backward_pass(graph: DependencyGraph, cpm_order: List[int], start: List[int],
+                               finish: List[int], assigned_to: List[str]):
+    """
+    Passe arrière sur le planning contraint: successeurs = dépendances + tâche suivante
+    sur la même ressource si elle l'a attendue, fin au plus tard du projet = fin du planning contraint
+    """
+    n = len(graph)
+    position = [0] * n
+    for rank, node in enumerate(cpm_order):
+        position[node] = rank
+    # Extension linéaire des deux types d'arêtes (le rang topologique départage les tâches de durée nulle)
+    order = sorted(range(n), key=lambda i: (start[i], finish[i], position[i]))
+
+    # Arête de ressource seulement si la tâche suivante a attendu ce worker: prête (dépendances finies)
+    # avant son début, aucun autre worker du rôle n'était libre. Sinon la ressource n'est pas contraignante.
+    predecessors = graph.predecessors
+    next_on_resource = [-1] * n
+    last_on_resource: Dict[str, int] = {}
+    for node in order:
+        previous = last_on_resource.get(assigned_to[node])
+        if previous is not None and finish[previous] == start[node]:
+            ready = max((finish[pred] for pred in predecessors[node]), default=0)
+            if ready < start[node]:
+                next_on_resource[previous] = node
+        last_on_resource[assigned_to[node]] = node
+
+    project_length = max(finish, default=0)
+    durations = graph.durations
+    successors = graph.successors
+    latest_start = [0] * n
+    for node in reversed(order):
+        latest_finish = project_length
+        for succ in successors[node]:
+            if latest_start[succ] < latest_finish:
+                latest_finish = latest_start[succ]
+        following = next_on_resource[node]
+        if following >= 0 and latest_start[following] < latest_finish:
+            latest_finish = latest_start[following]
+        latest_start[node] = latest_finish - durations[node]
+
+    return latest_start, [latest_start[i] - start[i] for i in range(n)]
+
+
+def compute_resource_schedule(graph: DependencyGraph, capacity: Dict[str, int],
+                              roles: List[str] = None, priorities: List[int] = None) -> ResourceScheduleResult:
+    """
+    List scheduling à événements discrets en O((V+E) log V).
+    `capacity` donne le nombre de ressources par rôle; une tâche sans rôle connu va dans DEFAULT_ROLE.
+    Parmi les tâches prêtes, on sert d'abord la priorité puis la plus longue chaîne restante (CPM).
+    """
+    n = len(graph)
+    cpm = compute_schedule(graph)  # valide aussi l'absence de cycle
+    tail = [cpm.project_length - cpm.latest_start[i] for i in range(n)]
+    priorities = priorities or [PRIORITY_RANKS["medium"]] * n
+    roles = [role if role in capacity else DEFAULT_ROLE for role in (roles or [DEFAULT_ROLE] * n)]
+    if any(capacity.get(role, 0) < 1 for role in set(roles)):
+        raise ValueError("Chaque rôle utilisé doit disposer d'au moins une ressource")
+
+    durations = graph.durations
+    successors = graph.successors
+    indegree = [len(preds) for preds in graph.predecessors]
+    free: Dict[str, List[str]] = {
+        role: [f"{role}-{k}" for k in range(count, 0, -1)] for role, count in capacity.items()
+    }
+    ready: Dict[str, list] = {role: [] for role in capacity}
+    for i in range(n):
+        if indegree[i] == 0:
+            heapq.heappush(ready[roles[i]], (priorities[i], -tail[i], i))
+
+    start = [0] * n
+    finish = [0] * n
+    assigned_to = [""] * n
+    running: list = []
+    now = 0
+    remaining = n
+
+    while remaining:
+        for role, queue in ready.items():
+            workers = free[role]
+            while queue and workers:
+                _, _, i = heapq.heappop(queue)
+                start[i] = now
+                finish[i] = now + durations[i]
+                assigned_to[i] = workers.pop()
+                heapq.heappush(running, (finish[i], i))
+
+        now = running[0][0]
+        while running and running[0][0] == now:
+            _, i = heapq.heappop(running)
+            remaining -= 1
+            free[roles[i]].append(assigned_to[i])
+            for succ in successors[i]:
+                indegree[succ] -= 1
+                if indegree[succ] == 0:
+                    heapq.heappush(ready[roles[succ]], (priorities[succ], -tail[succ], succ))
+
+    latest_start, slack = _constrained_backward_pass(graph, cpm.order, start, finish, assigned_to)
+    return ResourceScheduleResult(start, finish, assigned_to, max(finish, default=0), latest_start, slack)
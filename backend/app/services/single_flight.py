@@ -0,0 +1,44 @@
+# backend/app/services/single_flight.py
+"""
+Single-flight: les appels concurrents avec la même clé partagent un seul calcul en cours
+"""
+import asyncio
+import copy
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._counters = {"calls": 0, "executions": 0, "coalesced": 0}
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Lance `factory()` si aucun calcul n'est en cours pour `key`, sinon attend celui en cours.
+        Les appelants rattachés reçoivent une copie profonde du résultat (ils peuvent la modifier).
+        L'annulation d'un appelant n'annule pas le calcul partagé.
+        """
+        self._counters["calls"] += 1
+        task = self._in_flight.get(key)
+        if task is not None:
+            self._counters["coalesced"] += 1
+            return copy.deepcopy(await asyncio.shield(task))
+
+        self._counters["executions"] += 1
+        task = asyncio.ensure_future(factory())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self._counters["calls"]
+        stats = dict(self._counters)
+        stats.update({
+            "in_flight": len(self._in_flight),
+            "coalesced_ratio": round(self._counters["coalesced"] / calls, 4) if calls else 0.0,
+        })
+        return stats
+
+
+# Instance globale pour les appels des agents
+generation_flight = SingleFlight()
@@ -0,0 +1,157 @@
+# backend/app/services/work_calendar.py
+"""
+Calendrier ouvré: jours travaillés, jours fériés et index ordinal des jours ouvrés
+"""
+import threading
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional, Tuple, Union
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.project_calendar import ProjectCalendar
+
+WEEKDAY_NAMES = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+DEFAULT_WORKING_WEEKDAYS = (0, 1, 2, 3, 4)  # Lundi -> vendredi
+DEFAULT_ORIGIN = date(2000, 1, 1)
+
+DateLike = Union[date, datetime]
+_Index = Tuple[date, List[int], List[date]]
+
+
+def _to_date(day: DateLike) -> date:
+    return day.date() if isinstance(day, datetime) else day
+
+
+class WorkCalendar:
+    """
+    Calendrier avec index précalculé: `ranks[k]` = nombre de jours ouvrés avant `origin + k`,
+    `working_days[r]` = r-ième jour ouvré. Ajouter N jours ouvrés ou compter les jours ouvrés
+    entre deux dates sont des lookups O(1); l'index s'étend par doublement si besoin, et recule
+    son origine (nouvel index remplacé d'un bloc) pour une date antérieure.
+    Partagé entre threads: les extensions sont faites sous verrou et ne font qu'ajouter.
+    """
+
+    def __init__(self, working_weekdays: Iterable[int] = DEFAULT_WORKING_WEEKDAYS,
+                 holidays: Iterable[date] = (), origin: date = DEFAULT_ORIGIN, horizon_days: int = 0):
+        self.working_weekdays = frozenset(working_weekdays)
+        if not self.working_weekdays:
+            raise ValueError("Le calendrier doit contenir au moins un jour travaillé")
+        self.holidays = frozenset(holidays)
+        # (origin, ranks, working_days): chaque opération travaille sur un même instantané
+        self._index: Tuple[date, List[int], List[date]] = (origin, [], [])
+        self._lock = threading.Lock()
+        # Par défaut l'index couvre jusqu'à deux ans après aujourd'hui
+        self._extend(self._index, horizon_days or (date.today() - origin).days + 730)
+
+    @property
+    def origin(self) -> date:
+        return self._index[0]
+
+    # Picklable (pool de processus): l'index est transmis, le verrou est recréé
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _extend(self, index: _Index, days: int) -> None:
+        origin, ranks, working_days = index
+        with self._lock:
+            day = origin + timedelta(days=len(ranks))
+            one_day = timedelta(days=1)
+            for _ in range(days):
+                ranks.append(len(working_days))
+                if self.is_working_day(day):
+                    working_days.append(day)
+                day += one_day
+
+    def _rebase(self, day: date) -> _Index:
+        """Recule l'origine au 1er janvier de l'année de `day` (les rangs existants sont décalés)"""
+        with self._lock:
+            index = self._index
+            if day >= index[0]:
+                return index
+            origin = date(day.year, 1, 1)
+            ranks: List[int] = []
+            working_days: List[date] = []
+            current, one_day = origin, timedelta(days=1)
+            while current < index[0]:
+                ranks.append(len(working_days))
+                if self.is_working_day(current):
+                    working_days.append(current)
+                current += one_day
+            shift = len(working_days)
+            ranks.extend(rank + shift for rank in index[1])
+            working_days.extend(index[2])
+            self._index = (origin, ranks, working_days)
+            return self._index
+
+    def _locate(self, day: DateLike) -> Tuple[_Index, int]:
+        """Instantané de l'index couvrant `day` et position de `day` dans cet index"""
+        day = _to_date(day)
+        index = self._index
+        if day < index[0]:
+            index = self._rebase(day)
+        return index, self._offset(index, day)
+
+    def _offset(self, index: _Index, day: DateLike) -> int:
+        offset = (_to_date(day) - index[0]).days
+        while offset >= len(index[1]):
+            self._extend(index, len(index[1]))
+        return offset
+
+    def _working_day_at(self, index: _Index, rank: int) -> date:
+        while rank >= len(index[2]):
+            self._extend(index, len(index[1]))
+        return index[2][rank]
+
+    def is_working_day(self, day: DateLike) -> bool:
+        if isinstance(day, datetime):
+            day = day.date()
+        return day.weekday() in self.working_weekdays and day not in self.holidays
+
+    def rank(self, day: DateLike) -> int:
+        """Nombre de jours ouvrés entre l'origine de l'index et `day` (exclu)"""
+        index, offset = self._locate(day)
+        return index[1][offset]
+
+    def next_working_day(self, day: DateLike) -> date:
+        """`day` s'il est ouvré, sinon le prochain jour ouvré"""
+        index, offset = self._locate(day)
+        return self._working_day_at(index, index[1][offset])
+
+    def add_working_days(self, day: DateLike, days: int) -> date:
+        """Date atteinte après `days` jours ouvrés à partir de `day` (ramené au prochain jour ouvré)"""
+        index, offset = self._locate(day)
+        return self._working_day_at(index, index[1][offset] + days)
+
+    def working_days_between(self, start: DateLike, end: DateLike) -> int:
+        """Jours ouvrés dans [start, end)"""
+        start, end = _to_date(start), _to_date(end)
+        # Les deux rangs dans le même index (même origine)
+        index, _ = self._locate(min(start, end))
+        return index[1][self._offset(index, end)] - index[1][self._offset(index, start)]
+
+    def mermaid_excludes(self) -> str:
+        """Valeur de la directive `excludes` d'un Gantt Mermaid"""
+        off_days = [i for i in range(7) if i not in self.working_weekdays]
+        parts = ["weekends"] if off_days == [5, 6] else [WEEKDAY_NAMES[i] for i in off_days]
+        parts.extend(holiday.isoformat() for holiday in sorted(self.holidays))
+        return ", ".join(parts)
+
+
+DEFAULT_CALENDAR = WorkCalendar()
+
+
+def calendar_from_model(model: Optional[ProjectCalendar]) -> WorkCalendar:
+    """Construit le calendrier d'un projet; calendrier par défaut si le projet n'en a pas"""
+    if model is None:
+        return DEFAULT_CALENDAR
+    working_weekdays = [int(day) for day in (model.working_weekdays or "").split(",") if day.strip()]
+    holidays = [date.fromisoformat(day.strip()) for day in (model.holidays or "").split(",") if day.strip()]
+    return WorkCalendar(working_weekdays or DEFAULT_WORKING_WEEKDAYS, holidays)
+
+
+async def load_project_calendar(db: AsyncSession, project_id: int) -> WorkCalendar:
+    return calendar_from_model(await db.get(ProjectCalendar, project_id))
@@ -0,0 +1,60 @@
+# backend/benchmarks/batch_generation.py
+"""
+Compare l'import d'un portefeuille projet par projet (POST /generate) à un seul
+appel POST /generate-batch (génération concurrente, persistance par paquets).
+
+Usage (depuis backend/, base SQLite temporaire):
+    python -m benchmarks.batch_generation --projects 200
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/benchmark.db"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.services.generation_cache import generation_cache  # noqa: E402
+from main import app  # noqa: E402
+
+
+def make_projects(n, phase):
+    # Descriptions propres à chaque phase: le lot ne doit pas être servi par le cache de génération
+    return [
+        {"name": f"Projet {phase}-{i}",
+         "description": f"Application web e-commerce {phase}-{i} avec login et dashboard admin",
+         "start_date": "2025-01-06"}
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=200)
+    args = parser.parse_args()
+    with TestClient(app) as client:
+        generation_cache.clear()
+        started = time.perf_counter()
+        for project in make_projects(args.projects, "sequentiel"):
+            client.post("/api/projects/generate", json=project).raise_for_status()
+        sequential = time.perf_counter() - started
+
+        generation_cache.clear()
+        hits_before = generation_cache.stats()
+        started = time.perf_counter()
+        response = client.post("/api/projects/generate-batch", json=make_projects(args.projects, "lot"))
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        batch = time.perf_counter() - started
+        hits_after = generation_cache.stats()
+
+    ok = sum(line["status"] == "ok" for line in lines)
+    print(f"{args.projects} projets: un appel par projet {sequential:7.2f}s   "
+          f"lot {batch:7.2f}s ({ok} ok)   x{sequential / batch:.1f}")
+    cache_hits = sum(hits_after[key] - hits_before[key] for key in ("memory_hits", "persistent_hits"))
+    print(f"hits du cache de génération pendant le lot: {cache_hits}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# backend/benchmarks/bulk_insert.py
+"""
+Compare l'insertion ligne par ligne (add + commit + refresh) à l'insertion
+en masse (INSERT ... RETURNING) pour les tâches et user stories générées.
+
+Usage (depuis backend/):
+    python -m benchmarks.bulk_insert
+"""
+import asyncio
+import os
+import tempfile
+import time
+from datetime import date
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.models import job, project_calendar, task_dependency  # noqa: F401 (relations)
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user_story import UserStory
+from app.services.persistence import (
+    bulk_insert_tasks, bulk_insert_user_stories, story_values, task_values
+)
+
+SIZES = (20, 500, 5000)
+
+
+def make_tasks(n):
+    return [
+        {"title": f"Tâche {i}", "description": "Benchmark", "duration_days": 1 + i % 5,
+         "priority": "medium", "status": "todo", "dependencies": str(i) if i else "", "order": i}
+        for i in range(n)
+    ]
+
+
+def make_stories(n):
+    return [
+        {"title": f"Story {i}", "description": "Benchmark", "points": 3, "priority": "Should Have",
+         "status": "todo", "sprint": i // 5 + 1, "acceptance_criteria": "1. OK"}
+        for i in range(n)
+    ]
+
+
+async def per_row(db, project_id, tasks, stories):
+    tasks_list = [Task(**task_values(project_id, t)) for t in tasks]
+    stories_list = [UserStory(**story_values(project_id, s)) for s in stories]
+    db.add_all(tasks_list)
+    db.add_all(stories_list)
+    await db.commit()
+    for task in tasks_list:
+        await db.refresh(task)
+    for story in stories_list:
+        await db.refresh(story)
+
+
+async def bulk(db, project_id, tasks, stories):
+    await bulk_insert_tasks(db, project_id, tasks)
+    await bulk_insert_user_stories(db, project_id, stories)
+    await db.commit()
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+        print(f"{'rows':>6} | {'per-row (ms)':>12} | {'bulk (ms)':>10} | speedup")
+        for n in SIZES:
+            timings = {}
+            for label, strategy in (("per_row", per_row), ("bulk", bulk)):
+                async with sessions() as db:
+                    project = Project(name="Bench", description="Bench", start_date=date(2025, 1, 6))
+                    db.add(project)
+                    await db.commit()
+                    started = time.perf_counter()
+                    await strategy(db, project.id, make_tasks(n), make_stories(n))
+                    timings[label] = (time.perf_counter() - started) * 1000
+            print(f"{n:>6} | {timings['per_row']:>12.1f} | {timings['bulk']:>10.1f} | "
+                  f"x{timings['per_row'] / timings['bulk']:.1f}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
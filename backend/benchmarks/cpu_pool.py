@@ -0,0 +1,74 @@
+# backend/benchmarks/cpu_pool.py
+"""
+Compare le pool de threads et le pool de processus (run_cpu) sur des étapes d'agents
+en rafale: générateurs locaux, Tech Advisor, planning et Gantt de gros projets.
+Mesure le débit et la latence de la boucle d'événements pendant la charge.
+
+Usage (depuis backend/):
+    python -m benchmarks.cpu_pool --projects 64 --tasks 5000 --processes 4
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from app.agents.scheduler_agent import SchedulerAgent
+from app.agents.tech_advisor_agent import TechAdvisorAgent
+from app.core import executor
+from app.core.config import settings
+from app.services.gemini_service import generate_tasks_local, generate_user_stories_local
+from app.services.project_generation import generate_gantt_code
+from benchmarks.resource_scheduler import make_tasks
+
+DESCRIPTION = "Application web e-commerce avec login, paiement Stripe, app mobile et dashboard admin"
+
+
+async def project(tasks, scheduler, advisor):
+    await asyncio.gather(
+        executor.run_cpu(generate_tasks_local, DESCRIPTION),
+        executor.run_cpu(generate_user_stories_local, DESCRIPTION),
+        executor.run_cpu(advisor.recommend_stack, DESCRIPTION),
+    )
+    scheduled = await executor.run_cpu(scheduler.create_schedule, tasks, datetime(2025, 1, 6))
+    await executor.run_cpu(generate_gantt_code, scheduled, "Benchmark")
+
+
+async def loop_lag(stop: asyncio.Event, samples: list):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        samples.append(time.perf_counter() - started - 0.01)
+
+
+async def run(projects, tasks):
+    scheduler, advisor = SchedulerAgent(), TechAdvisorAgent()
+    await executor.start_cpu_pool()
+    stop, samples = asyncio.Event(), []
+    ticker = asyncio.create_task(loop_lag(stop, samples))
+    started = time.perf_counter()
+    await asyncio.gather(*(project(tasks, scheduler, advisor) for _ in range(projects)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+    executor.shutdown_cpu_pool()
+    samples.sort()
+    return elapsed, samples[len(samples) // 2] * 1000, samples[-1] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=64)
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+
+    tasks = [{**task, "title": f"Tâche {task['id']}"} for task in make_tasks(args.tasks)]
+    for label, workers in (("threads", 0), (f"{args.processes} processus", args.processes)):
+        settings.CPU_POOL_WORKERS = workers
+        elapsed, lag_p50, lag_max = asyncio.run(run(args.projects, tasks))
+        print(f"{label:<12}: {args.projects} projets x {args.tasks} tâches en {elapsed:6.2f}s   "
+              f"latence boucle p50 {lag_p50:6.1f} ms  max {lag_max:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# backend/benchmarks/health_under_load.py
+"""
+Mesure la latence de /health pendant des appels concurrents à /generate-tasks.
+
+Usage (serveur lancé avec `python main.py`):
+    python benchmarks/health_under_load.py --url http://localhost:8000 --concurrency 20 --requests 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+PROJECT = {
+    "name": "Benchmark",
+    "description": "Application web e-commerce avec login, paiement Stripe et dashboard admin",
+    "start_date": "2025-01-06",
+}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def generate_worker(client: httpx.AsyncClient, remaining: list):
+    while remaining:
+        remaining.pop()
+        await client.post("/api/projects/generate-tasks", json=PROJECT)
+
+
+async def probe_health(client: httpx.AsyncClient, stop: asyncio.Event, latencies: list):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/health")
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.01)
+
+
+async def run(url: str, concurrency: int, total: int):
+    limits = httpx.Limits(max_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=120) as client:
+        # Ligne de base sans charge
+        idle, stop = [], asyncio.Event()
+        probe = asyncio.create_task(probe_health(client, stop, idle))
+        await asyncio.sleep(2)
+        stop.set()
+        await probe
+
+        loaded, stop = [], asyncio.Event()
+        probe = asyncio.create_task(probe_health(client, stop, loaded))
+        remaining = list(range(total))
+        started = time.perf_counter()
+        await asyncio.gather(*(generate_worker(client, remaining) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe
+
+    for label, values in (("idle", idle), ("under load", loaded)):
+        print(f"/health {label:>10}: n={len(values):5d}  p50={statistics.median(values):7.2f} ms  "
+              f"p99={percentile(values, 99):7.2f} ms  max={max(values):7.2f} ms")
+    print(f"/generate-tasks: {total} requests in {elapsed:.2f}s ({total / elapsed:.1f} req/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.concurrency, args.requests))
@@ -0,0 +1,82 @@
+# backend/benchmarks/llm_provider.py
+"""
+Débit du fournisseur HTTP contre le stub local: client partagé (keep-alive) vs un client par requête.
+Le stub tourne dans le même processus, sur un port libre.
+
+Usage (depuis backend/):
+    python -m benchmarks.llm_provider --requests 400 --concurrency 32 --latency-ms 50
+"""
+import argparse
+import asyncio
+import socket
+import threading
+import time
+
+import httpx
+import uvicorn
+
+from app.services.llm_provider import HTTPProvider
+from benchmarks.health_under_load import percentile
+from scripts.llm_stub_server import create_app
+
+DESCRIPTION = "Application web e-commerce avec login, paiement Stripe et dashboard admin"
+
+
+def start_stub(**options) -> str:
+    """Lance le stub (options de create_app) dans un thread et retourne son URL"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(
+        create_app(**options), host="127.0.0.1", port=port,
+        log_level="warning", backlog=4096
+    ))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+async def run(label: str, base_url: str, requests: int, concurrency: int, shared: bool):
+    httpx.post(f"{base_url}/stats/reset")
+    provider = HTTPProvider(base_url, "stub", max_concurrency=concurrency, retry_base=0.05, http2=False)
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            # Sans partage: un fournisseur (donc un client et une connexion) par requête
+            current = provider if shared else HTTPProvider(base_url, "stub", retry_base=0.05, http2=False)
+            started = time.perf_counter()
+            await current.generate_json("planner", DESCRIPTION, f"Tâches\nProjet: {DESCRIPTION} #{i % 8}")
+            latencies.append((time.perf_counter() - started) * 1000)
+            if not shared:
+                await current.aclose()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    await provider.aclose()
+    stub = httpx.get(f"{base_url}/stats").json()
+    print(f"{label:<22} {requests / elapsed:8.1f} req/s  p50 {percentile(latencies, 50):7.1f} ms  "
+          f"p95 {percentile(latencies, 95):7.1f} ms  connexions {stub['connections']:>5}  "
+          f"erreurs stub {stub['errors']}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    base_url = start_stub(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate)
+    print(f"stub {base_url}: latence {args.latency_ms} ms, {args.requests} requêtes, concurrence {args.concurrency}")
+    asyncio.run(run("client par requête", base_url, args.requests, args.concurrency, shared=False))
+    asyncio.run(run("client partagé", base_url, args.requests, args.concurrency, shared=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# backend/benchmarks/project_classifier.py
+"""
+Classification des descriptions: scans `any(word in desc)` refaits par chaque agent (ancienne
+approche) vs classify_project calculé une fois, sur des descriptions de tailles croissantes,
+avec des mots-clés présents tôt ("hits") ou absents ("aucun", pire cas).
+
+Usage (depuis backend/):
+    python -m benchmarks.project_classifier --sizes 200 5000 100000 --repeat 200
+"""
+import argparse
+import random
+import time
+
+from app.services.project_classifier import FEATURE_KEYWORDS, PROJECT_TYPES, classify_project
+
+FILLER = ("plateforme", "collaborative", "pour", "les", "équipes", "avec", "suivi", "des", "projets",
+          "et", "un", "espace", "client", "sécurisé", "rapports", "mensuels")
+
+
+def make_description(size: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    keywords = [word for flags in FEATURE_KEYWORDS.values() for words in flags.values() for word in words]
+    parts = []
+    length = 0
+    while length < size:
+        word = rng.choice(keywords) if rng.random() < 0.02 else rng.choice(FILLER)
+        parts.append(word)
+        length += len(word) + 1
+    return " ".join(parts)[:size]
+
+
+def scan_classify(description: str):
+    """Ancienne approche: chaque agent met en minuscules et scanne ses propres listes"""
+    flags = {}
+    for consumer, consumer_flags in FEATURE_KEYWORDS.items():
+        desc_lower = description.lower()
+        for flag, words in consumer_flags.items():
+            flags[(consumer, flag)] = any(word in desc_lower for word in words)
+    project_type = next((name for name, words in PROJECT_TYPES if any(w in desc_lower for w in words)), None)
+    return flags, project_type
+
+
+def bench(func, description: str, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(description)
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 5000, 100000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        repeat = max(5, args.repeat * 200 // size) if size > 200 else args.repeat
+        for label, description in (("hits", make_description(size)), ("aucun", ("lorem " * size)[:size])):
+            scans = bench(scan_classify, description, repeat)
+            single = bench(classify_project, description, repeat)
+            print(f"{size:>7} caractères, mots-clés {label:<5}: scans par agent {scans:9.1f} µs   "
+                  f"classification partagée {single:9.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
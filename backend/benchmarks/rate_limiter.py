@@ -0,0 +1,92 @@
+# backend/benchmarks/rate_limiter.py
+"""
+Appels LLM contre un stub à quota (429 au-delà de --rpm): sans limiteur, les retries
+s'enchaînent en rafales; avec le limiteur au même quota, le débit soutenu est atteint sans 429.
+Mesure aussi l'équité: un petit projet et des appels interactifs face à un gros lot en arrière-plan.
+
+Usage (depuis backend/):
+    python -m benchmarks.rate_limiter --rpm 1200 --burst 20 --requests 300
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from app.services.llm_provider import HTTPProvider
+from app.services.rate_limiter import BACKGROUND, RateLimiter, llm_context
+from benchmarks.health_under_load import percentile
+from benchmarks.llm_provider import DESCRIPTION, start_stub
+
+PROMPT = f"Tâches\nProjet: {DESCRIPTION}"
+
+
+def make_provider(base_url: str, limiter):
+    return HTTPProvider(base_url, "stub", max_concurrency=64, max_retries=8, retry_base=0.05,
+                        retry_max=2.0, http2=False, limiter=limiter, completion_tokens=500)
+
+
+async def timed_call(provider, latencies: list, project: str = "default", priority: str = None) -> bool:
+    """Retourne False si l'appel a échoué après tous ses retries"""
+    with llm_context(project=project, priority=priority):
+        started = time.perf_counter()
+        try:
+            await provider.generate_json("planner", DESCRIPTION, PROMPT)
+        except httpx.HTTPStatusError:
+            return False
+        latencies.append((time.perf_counter() - started) * 1000)
+        return True
+
+
+async def storm(label: str, base_url: str, requests: int, limiter):
+    httpx.post(f"{base_url}/stats/reset")
+    provider = make_provider(base_url, limiter)
+    latencies = []
+    started = time.perf_counter()
+    results = await asyncio.gather(*(timed_call(provider, latencies) for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    await provider.aclose()
+    stub = httpx.get(f"{base_url}/stats").json()
+    print(f"{label:<16} {len(latencies) / elapsed:6.1f} req/s  p95 {percentile(latencies, 95):8.1f} ms  "
+          f"requêtes envoyées {stub['requests']:>5}  429 {stub['rate_limited']:>5}  "
+          f"échecs {results.count(False)}")
+
+
+async def fairness(base_url: str, requests: int, limiter):
+    httpx.post(f"{base_url}/stats/reset")
+    provider = make_provider(base_url, limiter)
+    big, small, interactive = [], [], []
+    with llm_context(priority=BACKGROUND):
+        batch = [asyncio.ensure_future(timed_call(provider, big, project="gros-lot")) for _ in range(requests)]
+    await asyncio.sleep(0.5)
+    # Arrivés après le lot: un petit projet en arrière-plan et des requêtes interactives
+    with llm_context(priority=BACKGROUND):
+        late = [asyncio.ensure_future(timed_call(provider, small, project="petit")) for _ in range(10)]
+    late += [asyncio.ensure_future(timed_call(provider, interactive, project="ui")) for _ in range(10)]
+    await asyncio.gather(*batch, *late)
+    await provider.aclose()
+    print(f"équité: gros lot (arrière-plan) moyenne {statistics.mean(big):8.1f} ms, "
+          f"petit projet {statistics.mean(small):8.1f} ms, interactif {statistics.mean(interactive):8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rpm", type=int, default=1200)
+    parser.add_argument("--burst", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    base_url = start_stub(latency_ms=args.latency_ms, requests_per_minute=args.rpm, burst=args.burst)
+    print(f"stub {base_url}: quota {args.rpm}/min (rafale {args.burst}), {args.requests} appels simultanés")
+    burst_seconds = args.burst * 60 / args.rpm
+    asyncio.run(storm("sans limiteur", base_url, args.requests, None))
+    time.sleep(burst_seconds)  # Le quota du stub se reconstitue
+    asyncio.run(storm("avec limiteur", base_url, args.requests, RateLimiter(args.rpm, 0, burst_seconds)))
+    time.sleep(burst_seconds)
+    asyncio.run(fairness(base_url, args.requests, RateLimiter(args.rpm, 0, burst_seconds)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# backend/benchmarks/response_encoding.py
+"""
+Temps d'encodage de la réponse de /generate pour un gros projet, rapporté à 10k tâches:
+- chemin d'origine: dicts écrits à la main, jsonable_encoder puis module json (JSONResponse)
+- chemin typé: GeneratedProjectResponse construit depuis les lignes ORM, sérialisé par pydantic-core
+- orjson sur les dicts d'origine, pour référence (si installé)
+Vérifie aussi que les deux chemins produisent le même JSON.
+
+Usage (depuis backend/):
+    python -m benchmarks.response_encoding --tasks 10000 --stories 2000 --repeat 5
+"""
+import argparse
+import json
+import time
+from datetime import date, datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.responses import PydanticJSONResponse
+from app.models import job, project_calendar, task_dependency  # noqa: F401 (relations des modèles)
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user_story import UserStory
+from app.schemas.generation import GeneratedProjectResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+AGENTS_USED = [{"name": name, "status": "completed"} for name in ("Planner", "Scheduler", "Backlog", "Tech Advisor")]
+
+
+def make_rows(tasks: int, stories: int):
+    """Lignes ORM non persistées, comme retournées par les INSERT ... RETURNING"""
+    start = date(2026, 1, 5)
+    project = Project(id=1, name="Benchmark", description="Projet de benchmark", start_date=start,
+                      status="active", created_at=datetime(2026, 1, 5, 9, 30, 12, 123456))
+    tasks_list = [
+        Task(id=i + 1, project_id=1, title=f"Tâche {i + 1}", description="Implémenter la fonctionnalité " * 4,
+             duration_days=1 + i % 5, start_date=start + timedelta(days=i // 4),
+             end_date=start + timedelta(days=i // 4 + 1 + i % 5), priority=("low", "medium", "high")[i % 3],
+             status="todo", dependencies=str(i) if i else None, order=i)
+        for i in range(tasks)
+    ]
+    stories_list = [
+        UserStory(id=i + 1, project_id=1, title=f"En tant qu'utilisateur, je veux la fonction {i + 1}",
+                  description="Afin de gagner du temps", points=(1, 2, 3, 5, 8)[i % 5], priority="Must Have",
+                  status="todo", sprint=1 + i // 10, acceptance_criteria="- critère 1\n- critère 2")
+        for i in range(stories)
+    ]
+    return project, tasks_list, stories_list
+
+
+def result_for(project: Project):
+    return {"name": project.name, "tech_recommendations": {"project_type": "web", "frontend": ["React"]},
+            "metrics": {"total_tasks": 0}, "agents_used": AGENTS_USED}
+
+
+def legacy_content(project, tasks_list, stories_list, gantt_code):
+    """Réponse d'origine: dicts écrits à la main"""
+    result = result_for(project)
+    return {
+        "success": True,
+        "project": {
+            "id": project.id, "name": project.name, "description": project.description,
+            "start_date": project.start_date.isoformat(),
+            "created_at": project.created_at.isoformat() if project.created_at else None,
+            "status": project.status
+        },
+        "tasks": [{
+            "id": task.id, "title": task.title, "description": task.description,
+            "duration_days": task.duration_days,
+            "start_date": task.start_date.isoformat() if task.start_date else None,
+            "end_date": task.end_date.isoformat() if task.end_date else None,
+            "priority": task.priority, "status": task.status, "dependencies": task.dependencies, "order": task.order
+        } for task in tasks_list],
+        "user_stories": [{
+            "id": story.id, "title": story.title, "description": story.description, "points": story.points,
+            "priority": story.priority, "status": story.status, "sprint": story.sprint,
+            "acceptance_criteria": story.acceptance_criteria
+        } for story in stories_list],
+        "gantt_code": gantt_code,
+        "tech_recommendations": result["tech_recommendations"],
+        "metrics": result["metrics"],
+        "agents_used": result["agents_used"]
+    }
+
+
+def legacy(rows, gantt_code) -> bytes:
+    # Ce que faisait FastAPI avec le dict retourné par la route
+    return JSONResponse(jsonable_encoder(legacy_content(*rows, gantt_code))).body
+
+
+def typed(rows, gantt_code) -> bytes:
+    # Comme generated_project_response: lignes ORM passées telles quelles
+    project, tasks_list, stories_list = rows
+    result = result_for(project)
+    response = GeneratedProjectResponse.model_validate({
+        "project": project, "tasks": tasks_list, "user_stories": stories_list, "gantt_code": gantt_code,
+        "tech_recommendations": result["tech_recommendations"], "metrics": result["metrics"],
+        "agents_used": result["agents_used"]
+    }, from_attributes=True)
+    return PydanticJSONResponse(response).body
+
+
+def with_orjson(rows, gantt_code) -> bytes:
+    return orjson.dumps(legacy_content(*rows, gantt_code))
+
+
+def measure(encode, rows, gantt_code, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = encode(rows, gantt_code)
+        timings.append(time.perf_counter() - started)
+    return min(timings), body
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--stories", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.tasks, args.stories)
+    gantt_code = "\n".join(f"    {task.title} :crit, {task.start_date}, {task.duration_days}d" for task in rows[1])
+    paths = [("dicts + jsonable_encoder + json", legacy), ("modèles typés + pydantic-core", typed)]
+    if orjson is not None:
+        paths.append(("dicts + orjson (référence)", with_orjson))
+
+    print(f"Réponse de /generate: {args.tasks} tâches, {args.stories} stories (meilleur de {args.repeat})")
+    bodies = {}
+    baseline = None
+    for label, encode in paths:
+        elapsed, body = measure(encode, rows, gantt_code, args.repeat)
+        bodies[label] = body
+        baseline = baseline or elapsed
+        per_10k = elapsed * 1000 * 10000 / max(args.tasks, 1)
+        print(f"{label:<34}: {elapsed * 1000:8.1f} ms  ({per_10k:7.1f} ms / 10k tâches, "
+              f"{len(body) / 1e6:5.2f} Mo, x{baseline / elapsed:4.1f})")
+
+    reference = json.loads(bodies[paths[0][0]])
+    identical = all(json.loads(body) == reference for body in bodies.values())
+    print(f"\nJSON identique entre les chemins: {'oui' if identical else 'NON'}")
+
+
+if __name__ == "__main__":
+    main()
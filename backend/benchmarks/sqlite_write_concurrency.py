@@ -0,0 +1,94 @@
+# backend/benchmarks/sqlite_write_concurrency.py
+"""
+Débit d'écriture SQLite sous concurrence: moteur par défaut (journal rollback, synchronous=FULL)
+contre le profil de app/core/database.py (WAL, busy_timeout, synchronous=NORMAL, cache, mmap).
+Des threads écrivains commitent chacun un projet et ses tâches pendant que des lecteurs
+parcourent les tâches; on compte les transactions, les lectures et les "database is locked".
+
+Usage (depuis backend/):
+    python -m benchmarks.sqlite_write_concurrency --writers 8 --readers 4 --seconds 5
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from datetime import date
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.exc import OperationalError
+
+from app.core.database import Base, build_engine
+from app.models import job, project_calendar, task_dependency  # noqa: F401 (relations)
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user_story import UserStory  # noqa: F401
+
+
+def write_project(engine, tasks_per_project):
+    with engine.begin() as connection:
+        project_id = connection.execute(
+            insert(Project).values(name="Benchmark", start_date=date(2025, 1, 6), status="active").returning(Project.id)
+        ).scalar_one()
+        connection.execute(insert(Task), [
+            {"project_id": project_id, "title": f"Tâche {i}", "duration_days": 1, "priority": "medium",
+             "status": "todo", "order": i}
+            for i in range(tasks_per_project)
+        ])
+
+
+def read_tasks(engine):
+    with engine.connect() as connection:
+        last = connection.execute(select(func.max(Project.id))).scalar() or 0
+        connection.execute(select(Task.id, Task.title).where(Task.project_id == last).order_by(Task.order)).all()
+
+
+def run(label, engine, writers, readers, seconds, tasks_per_project):
+    Base.metadata.create_all(bind=engine)
+    counters = {"commits": 0, "reads": 0, "locked": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def loop(action, counter):
+        while time.perf_counter() < deadline:
+            try:
+                action()
+                key = counter
+            except OperationalError as e:
+                if "locked" not in str(e):
+                    raise
+                key = "locked"
+            with lock:
+                counters[key] += 1
+
+    threads = [threading.Thread(target=loop, args=(lambda: write_project(engine, tasks_per_project), "commits"))
+               for _ in range(writers)]
+    threads += [threading.Thread(target=loop, args=(lambda: read_tasks(engine), "reads")) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    print(f"{label:<10}: {counters['commits'] / seconds:8.1f} commits/s   {counters['reads'] / seconds:8.1f} lectures/s   "
+          f"{counters['locked']:4d} 'database is locked'")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--tasks", type=int, default=20, help="Tâches insérées par transaction")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    # Un fichier par profil: le mode WAL est persistant dans le fichier
+    default_url = f"sqlite:///{os.path.join(directory, 'default.db')}"
+    tuned_url = f"sqlite:///{os.path.join(directory, 'tuned.db')}"
+    run("défaut", create_engine(default_url, connect_args={"check_same_thread": False}),
+        args.writers, args.readers, args.seconds, args.tasks)
+    run("optimisé", build_engine(tuned_url), args.writers, args.readers, args.seconds, args.tasks)
+
+
+if __name__ == "__main__":
+    main()
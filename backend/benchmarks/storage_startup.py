@@ -0,0 +1,82 @@
+# backend/benchmarks/storage_startup.py
+"""
+Démarrage et connexions de la couche de stockage: temps d'import de l'application
+(processus neufs), puis, dans ce processus, nombre de moteurs, de pools, de mappers par
+table et de connexions SQLite ouvertes après quelques requêtes, y compris en important
+l'ancien module app.services.database. Code de sortie 1 si plus d'un pool par moteur.
+
+Usage (depuis backend/, base SQLite temporaire):
+    python -m benchmarks.storage_startup --runs 5
+"""
+import argparse
+import gc
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/benchmark.db"
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import main, app.services.database; print(time.perf_counter() - t)"
+
+
+def import_times(runs):
+    times = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], capture_output=True, text=True, check=True)
+        times.append(float(output.stdout.strip().splitlines()[-1]))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    times = import_times(args.runs)
+    print(f"import main + app.services.database: médiane {statistics.median(times) * 1000:.0f} ms "
+          f"({args.runs} processus)")
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.orm import Mapper
+
+    import app.services.database  # noqa: F401 (ancien chemin d'import)
+    from app.core import database
+    from main import app
+
+    with TestClient(app) as client:
+        project = client.post("/api/projects", json={"name": "Benchmark", "start_date": "2025-01-06"}).json()
+        for _ in range(20):
+            client.get(f"/api/projects/{project['id']}")
+            client.get("/api/projects")
+
+    gc.collect()
+    engines = [obj for obj in gc.get_objects() if isinstance(obj, Engine)]
+    pools = {id(engine.pool) for engine in engines}
+    # Tous les mappers du processus, quel que soit leur registre (Base)
+    mappers = [obj for obj in gc.get_objects() if isinstance(obj, Mapper)]
+    mapped = Counter(mapper.local_table.name for mapper in mappers)
+    connections = sum(1 for obj in gc.get_objects() if isinstance(obj, sqlite3.Connection))
+    print(f"moteurs: {len(engines)} ({', '.join(engine.dialect.driver for engine in engines)})   pools: {len(pools)}")
+    print(f"mappers: {len(mappers)}   tables mappées plusieurs fois: "
+          f"{[table for table, count in mapped.items() if count > 1] or 'aucune'}")
+    print(f"connexions SQLite ouvertes: {connections}")
+
+    # Moteurs attendus: principal, async (aiosqlite) et lecture (le principal s'il n'y a ni réplica
+    # ni fichier SQLite), chacun avec son propre pool
+    expected = {id(database.engine), id(database.async_engine.sync_engine), id(database.read_engine)}
+    unexpected = [engine for engine in engines if id(engine) not in expected]
+    if unexpected:
+        print(f"moteurs inattendus: {', '.join(str(engine.url) for engine in unexpected)}")
+    ok = not unexpected and len(pools) == len(engines) and all(count == 1 for count in mapped.values())
+    print("OK: un seul pool par moteur" if ok else "ÉCHEC: moteurs ou mappers dupliqués")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
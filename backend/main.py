@@ -2,12 +2,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.core.database import engine, Base
-from app.api.routes import projects, agent_routes, phased_routes
-from app.models import project, task, user_story  # Import all models
+from app.core.executor import shutdown_cpu_pool, start_cpu_pool
+from app.core.database import init_db
+from app.api.routes import projects, agent_routes, phased_routes, metrics, jobs
+from app.services.job_queue import job_queue
+from app.services.gemini_service import gemini_service
 
 # Créer les tables
-Base.metadata.create_all(bind=engine)
+init_db()
 
 # Initialiser FastAPI
 app = FastAPI(
@@ -23,12 +25,35 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Pagination des listes
 )
 
 # Routes
 app.include_router(phased_routes.router, prefix="/api/projects", tags=["phased"])
 app.include_router(agent_routes.router, prefix="/api/projects", tags=["agents"])
 app.include_router(projects.router, prefix="/api", tags=["projects"])
+app.include_router(metrics.router, prefix="/api/metrics", tags=["metrics"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
+
+@app.on_event("startup")
+async def start_job_queue():
+    await job_queue.start()
+
+@app.on_event("shutdown")
+async def stop_job_queue():
+    await job_queue.stop()
+
+@app.on_event("startup")
+async def start_cpu_pool_workers():
+    await start_cpu_pool()
+
+@app.on_event("shutdown")
+async def stop_cpu_pool_workers():
+    shutdown_cpu_pool()
+
+@app.on_event("shutdown")
+async def close_llm_provider():
+    await gemini_service.provider.aclose()
 
 @app.get("/")
 async def root():
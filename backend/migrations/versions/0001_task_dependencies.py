@@ -0,0 +1,71 @@
+"""task_dependencies edge table, backfilled from tasks.dependencies
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _legacy_edges(rows):
+    """
+    Arêtes (task_id, depends_on_id, project_id) depuis les lignes (id, project_id, order, dependencies).
+    Copie figée de la résolution de l'application: la migration ne dépend pas du code de app/
+    """
+    local_ids = {}
+    for task_id, project_id, order, _ in rows:
+        local_ids[(project_id, str((order or 0) + 1))] = task_id
+
+    edges = []
+    for task_id, project_id, _, dependencies in rows:
+        seen = set()
+        for dep_id in (dependencies or "").split(","):
+            depends_on_id = local_ids.get((project_id, dep_id.strip()))
+            if depends_on_id is not None and depends_on_id != task_id and depends_on_id not in seen:
+                seen.add(depends_on_id)
+                edges.append({"task_id": task_id, "depends_on_id": depends_on_id, "project_id": project_id})
+    return edges
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    # main.py crée les tables manquantes au démarrage: la table peut déjà exister (vide)
+    if not sa.inspect(bind).has_table("task_dependencies"):
+        op.create_table(
+            "task_dependencies",
+            sa.Column("task_id", sa.Integer(), sa.ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("depends_on_id", sa.Integer(), sa.ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+        )
+        op.create_index("ix_task_dependencies_project_id", "task_dependencies", ["project_id"])
+        op.create_index("ix_task_dependencies_depends_on_task", "task_dependencies", ["depends_on_id", "task_id"])
+
+    # Backfill depuis la colonne texte (identifiants locaux du Planner = order + 1).
+    # Toutes les tâches sont lues, y compris sans dépendances: elles sont les cibles des arêtes
+    rows = bind.execute(sa.text('SELECT id, project_id, "order", dependencies FROM tasks')).fetchall()
+    existing = {tuple(row) for row in bind.execute(sa.text("SELECT task_id, depends_on_id FROM task_dependencies"))}
+    edges = [edge for edge in _legacy_edges(rows) if (edge["task_id"], edge["depends_on_id"]) not in existing]
+    if edges:
+        bind.execute(
+            sa.text("INSERT INTO task_dependencies (task_id, depends_on_id, project_id) "
+                    "VALUES (:task_id, :depends_on_id, :project_id)"),
+            edges,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_dependencies_depends_on_task", table_name="task_dependencies")
+    op.drop_index("ix_task_dependencies_project_id", table_name="task_dependencies")
+    op.drop_table("task_dependencies")
@@ -0,0 +1,33 @@
+"""project_calendars: per-project working weekdays and holidays
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # main.py crée les tables manquantes au démarrage: la table peut déjà exister
+    if not sa.inspect(op.get_bind()).has_table("project_calendars"):
+        op.create_table(
+            "project_calendars",
+            sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("working_weekdays", sa.String(length=20), nullable=False, server_default="0,1,2,3,4"),
+            sa.Column("holidays", sa.Text(), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("project_calendars")
@@ -0,0 +1,42 @@
+"""listing indexes: keyset pagination of projects, tasks and user stories
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = (
+    ("ix_projects_status", "projects", ["status", "id"]),
+    ("ix_tasks_project_order", "tasks", ["project_id", "order", "id"]),
+    ("ix_tasks_project_status_order", "tasks", ["project_id", "status", "order", "id"]),
+    ("ix_tasks_project_priority_order", "tasks", ["project_id", "priority", "order", "id"]),
+    ("ix_user_stories_project_sprint", "user_stories", ["project_id", "sprint", "id"]),
+    ("ix_user_stories_project_status_sprint", "user_stories", ["project_id", "status", "sprint", "id"]),
+    ("ix_user_stories_project_priority_sprint", "user_stories", ["project_id", "priority", "sprint", "id"]),
+)
+
+
+def upgrade() -> None:
+    # main.py crée les tables manquantes au démarrage (avec leurs index): certains peuvent déjà exister
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if name not in {index["name"] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,39 @@
+"""index review: drop secondary indexes duplicating the primary key
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# `index=True` sur les clés primaires: doublon de la clé primaire (rowid en SQLite),
+# maintenu à chaque insertion sans jamais servir une requête
+INDEXES = (
+    ("ix_projects_id", "projects"),
+    ("ix_tasks_id", "tasks"),
+    ("ix_user_stories_id", "user_stories"),
+)
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for name, table in INDEXES:
+        if name in {index["name"] for index in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    for name, table in INDEXES:
+        op.create_index(name, table, ["id"])
@@ -0,0 +1,35 @@
+"""tasks.order and user_stories.sprint NOT NULL: keyset sort keys of the listings
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SORT_KEYS = (("tasks", "order"), ("user_stories", "sprint"))
+
+
+def upgrade() -> None:
+    # `col > NULL` n'est jamais vrai: une ligne NULL faisait sauter la suite de la page suivante
+    for table, column in SORT_KEYS:
+        op.execute(sa.text(f'UPDATE {table} SET "{column}" = 0 WHERE "{column}" IS NULL'))
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, existing_type=sa.Integer(), nullable=False)
+
+
+def downgrade() -> None:
+    for table, column in reversed(SORT_KEYS):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, existing_type=sa.Integer(), nullable=True)
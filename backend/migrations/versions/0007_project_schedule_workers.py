@@ -0,0 +1,29 @@
+"""projects.schedule_workers: team size of the last resource-levelled Gantt
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # NULL: planning CPM sans limite de ressources (replanification incrémentale du cône aval)
+    if "schedule_workers" not in {column["name"] for column in sa.inspect(op.get_bind()).get_columns("projects")}:
+        op.add_column("projects", sa.Column("schedule_workers", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("projects") as batch_op:
+        batch_op.drop_column("schedule_workers")
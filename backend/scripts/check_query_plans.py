@@ -0,0 +1,142 @@
+# backend/scripts/check_query_plans.py
+"""
+Vérifie avec EXPLAIN QUERY PLAN que les requêtes chaudes utilisent leurs index:
+aucun parcours complet d'une table de l'application, aucun tri temporaire.
+Par défaut, le schéma est construit dans une base SQLite temporaire comme en production
+(tables des modèles puis `alembic upgrade head`); code de sortie 1 en cas de régression.
+
+Usage (depuis backend/):
+    python -m scripts.check_query_plans
+    python -m scripts.check_query_plans --database-url sqlite:///./ai_pm_agent.db
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", help="Base existante à vérifier (SQLite), au lieu d'une base temporaire")
+    return parser.parse_args()
+
+
+ARGS = parse_args()
+# Avant l'import de l'application: la configuration lit DATABASE_URL
+os.environ["DATABASE_URL"] = ARGS.database_url or f"sqlite:///{tempfile.mkdtemp()}/query_plans.db"
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from sqlalchemy import select, text  # noqa: E402
+
+from app.api.routes.projects import (  # noqa: E402
+    PROJECTS_ORDER, SPRINT_STORIES_ORDER, TASKS_ORDER, USER_STORIES_ORDER
+)
+from app.core.database import engine, init_db  # noqa: E402
+from app.models import project_calendar  # noqa: E402,F401 (relation de Project)
+from app.models.job import Job  # noqa: E402
+from app.models.project import Project  # noqa: E402
+from app.models.task import Task  # noqa: E402
+from app.models.task_dependency import TaskDependency  # noqa: E402
+from app.models.user_story import UserStory  # noqa: E402
+from app.services.dependencies import downstream_cte  # noqa: E402
+from app.services.pagination import keyset_query  # noqa: E402
+
+TABLES = ("projects", "tasks", "user_stories", "task_dependencies", "jobs")
+FULL_SCAN = re.compile(rf"\bSCAN ({'|'.join(TABLES)})\b")
+
+
+def page(model, order_by, filters, fields=("id", "title")):
+    """Page suivante d'une liste, telle que construite par les routes de pagination"""
+    return keyset_query(model, list(fields), order_by, filters, [1] * len(order_by), 100)
+
+
+def downstream():
+    cte = downstream_cte(1)
+    return select(cte.c.id)
+
+
+# (description, requête, index acceptés)
+CHECKS = [
+    ("Gantt: tâches d'un projet par ordre",
+     select(Task).where(Task.project_id == 1).order_by(Task.order),
+     {"ix_tasks_project_order"}),
+    ("Liste des tâches",
+     page(Task, TASKS_ORDER, [Task.project_id == 1]),
+     {"ix_tasks_project_order"}),
+    ("Liste des tâches par statut",
+     page(Task, TASKS_ORDER, [Task.project_id == 1, Task.status == "todo"]),
+     {"ix_tasks_project_status_order"}),
+    ("Liste des tâches par priorité",
+     page(Task, TASKS_ORDER, [Task.project_id == 1, Task.priority == "high"]),
+     {"ix_tasks_project_priority_order"}),
+    ("Liste des stories",
+     page(UserStory, USER_STORIES_ORDER, [UserStory.project_id == 1]),
+     {"ix_user_stories_project_sprint"}),
+    ("Stories d'un sprint",
+     page(UserStory, SPRINT_STORIES_ORDER, [UserStory.project_id == 1, UserStory.sprint == 2]),
+     {"ix_user_stories_project_sprint"}),
+    ("Stories par statut",
+     page(UserStory, USER_STORIES_ORDER, [UserStory.project_id == 1, UserStory.status == "todo"]),
+     {"ix_user_stories_project_status_sprint"}),
+    ("Stories par priorité",
+     page(UserStory, USER_STORIES_ORDER, [UserStory.project_id == 1, UserStory.priority == "Must Have"]),
+     {"ix_user_stories_project_priority_sprint"}),
+    ("Stories d'un sprint par priorité",
+     page(UserStory, SPRINT_STORIES_ORDER,
+          [UserStory.project_id == 1, UserStory.sprint == 2, UserStory.priority == "Must Have"]),
+     {"ix_user_stories_project_priority_sprint", "ix_user_stories_project_sprint"}),
+    ("Liste des projets par statut",
+     page(Project, PROJECTS_ORDER, [Project.status == "active"], fields=("id", "name")),
+     {"ix_projects_status"}),
+    ("Suppression d'un projet: stories",
+     select(UserStory.id).where(UserStory.project_id == 1),
+     {"ix_user_stories_project_sprint", "ix_user_stories_project_status_sprint",
+      "ix_user_stories_project_priority_sprint"}),
+    ("Suppression d'un projet / planning: arêtes du projet",
+     select(TaskDependency.task_id, TaskDependency.depends_on_id).where(TaskDependency.project_id == 1),
+     {"ix_task_dependencies_project_id"}),
+    ("Successeurs d'une tâche",
+     select(TaskDependency.task_id).where(TaskDependency.depends_on_id == 1),
+     {"ix_task_dependencies_depends_on_task"}),
+    ("Cône aval (CTE récursive)",
+     downstream(),
+     {"ix_task_dependencies_depends_on_task"}),
+    ("File de jobs: prochain job prêt",
+     select(Job.id).where(Job.status == "queued", Job.run_after <= datetime(2026, 1, 1))
+     .order_by(Job.run_after, Job.id).limit(1),
+     {"ix_jobs_status_run_after"}),
+]
+
+
+def build_schema() -> None:
+    init_db()
+    command.upgrade(Config(os.path.join(os.path.dirname(__file__), "..", "alembic.ini")), "head")
+
+
+def main() -> int:
+    if not ARGS.database_url:
+        build_schema()
+    failures = 0
+    with engine.connect() as connection:
+        for label, query, indexes in CHECKS:
+            sql = str(query.compile(engine, compile_kwargs={"literal_binds": True}))
+            plan = [row[3] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+            problems = [line for line in plan if FULL_SCAN.search(line) or "TEMP B-TREE" in line]
+            if not any(index in line for line in plan for index in indexes):
+                problems.append(f"aucun des index attendus: {', '.join(sorted(indexes))}")
+            status = "OK  " if not problems else "FAIL"
+            print(f"{status} {label}")
+            for line in plan:
+                print(f"       {line}")
+            for problem in problems:
+                print(f"     ✗ {problem}")
+            failures += bool(problems)
+    print(f"\n{len(CHECKS) - failures}/{len(CHECKS)} requêtes utilisent leurs index")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
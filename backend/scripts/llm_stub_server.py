@@ -0,0 +1,93 @@
+# backend/scripts/llm_stub_server.py
+"""
+Serveur local qui imite l'API Gemini `generateContent`, pour tester le fournisseur HTTP hors ligne.
+Les réponses sont produites par le générateur local; la latence et le taux d'erreur sont configurables.
+
+Usage (depuis backend/):
+    python -m scripts.llm_stub_server --port 8081 --latency-ms 200 --jitter-ms 50 --error-rate 0.02 --rpm 600
+puis LLM_PROVIDER=http LLM_BASE_URL=http://127.0.0.1:8081 pour l'API.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.services.gemini_service import gemini_service
+from app.services.rate_limiter import TokenBucket
+
+
+def create_app(latency_ms: float = 200, jitter_ms: float = 0, error_rate: float = 0.0,
+               requests_per_minute: int = 0, burst: int = 0) -> FastAPI:
+    app = FastAPI(title="LLM stub")
+    stats = {"requests": 0, "errors": 0, "rate_limited": 0}
+    # Quota du fournisseur simulé: 429 + Retry-After au-delà de `requests_per_minute`
+    quota = TokenBucket(requests_per_minute, burst or None) if requests_per_minute else None
+    connections = set()  # (host, port) des clients: une entrée par connexion TCP
+
+    @app.post("/v1beta/models/{model}:generateContent")
+    async def generate_content(model: str, request: Request):
+        stats["requests"] += 1
+        connections.add((request.client.host, request.client.port))
+        body = await request.json()
+        prompt = body["contents"][0]["parts"][0]["text"]
+
+        if quota is not None:
+            wait = quota.time_until(1, time.monotonic())
+            if wait > 0:
+                stats["rate_limited"] += 1
+                return JSONResponse({"error": {"code": 429, "message": "quota exceeded"}},
+                                    status_code=429, headers={"Retry-After": f"{wait:.2f}"})
+            quota.consume(1)
+
+        await asyncio.sleep(max(0.0, latency_ms + random.uniform(-jitter_ms, jitter_ms)) / 1000)
+        if random.random() < error_rate:
+            stats["errors"] += 1
+            return JSONResponse({"error": {"code": 503, "message": "overloaded"}}, status_code=503)
+
+        description = prompt.rsplit("Projet:", 1)[-1].strip()
+        if "User Stories" in prompt:
+            items = gemini_service._generate_user_stories(description)
+        else:
+            items = gemini_service._generate_tasks(description)
+        text = json.dumps(items, ensure_ascii=False)
+        return {
+            "candidates": [{"content": {"parts": [{"text": text}], "role": "model"}}],
+            "usageMetadata": {"totalTokenCount": (len(prompt) + len(text)) // 4},
+            "modelVersion": model
+        }
+
+    @app.get("/stats")
+    async def get_stats():
+        return {**stats, "connections": len(connections)}
+
+    @app.post("/stats/reset")
+    async def reset_stats():
+        stats.update(requests=0, errors=0, rate_limited=0)
+        connections.clear()
+        return {"success": True}
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rpm", type=int, default=0, help="quota de requêtes par minute (0 = illimité)")
+    parser.add_argument("--burst", type=int, default=0, help="rafale autorisée (défaut: une minute de quota)")
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.latency_ms, args.jitter_ms, args.error_rate, args.rpm, args.burst),
+                host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()